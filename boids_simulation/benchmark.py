@@ -0,0 +1,233 @@
+"""
+性能基准模块
+测量 BoidsSystem 初始化、单步更新与渲染在不同粒子数、密度与精度下的耗时，
+输出步速率、峰值内存与分阶段耗时，结果以JSON保存以便跨版本对比
+"""
+
+from typing import Dict, List, Optional
+from dataclasses import asdict
+from pathlib import Path
+from datetime import datetime
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+import numpy as np
+
+from boids import BoidsConfig, BoidsSystem
+
+# 分阶段计时对应的 BoidsSystem 方法
+PHASES = {
+    "separation": "_calculate_separation",
+    "alignment": "_calculate_alignment",
+    "cohesion": "_calculate_cohesion",
+    "clamp": "_clamp_speed",
+    "boundary": "_apply_periodic_boundary",
+}
+
+# 默认结果目录
+RESULTS_DIR = Path(__file__).parent / "benchmarks"
+
+logger = logging.getLogger('BoidsBenchmark')
+
+
+class _PhaseTimer:
+    """以实例属性包装系统方法，累计各阶段耗时"""
+
+    def __init__(self, system: BoidsSystem):
+        self.totals = {phase: 0.0 for phase in PHASES}
+        for phase, method_name in PHASES.items():
+            setattr(system, method_name, self._wrap(phase, getattr(system, method_name)))
+
+    def _wrap(self, phase: str, method):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.totals[phase] += time.perf_counter() - start
+        return timed
+
+
+def make_config(num_boids: int, density: float, dtype: str, **overrides) -> BoidsConfig:
+    """按粒子密度（每单位面积粒子数）确定区域尺寸"""
+    screen_size = float(np.sqrt(num_boids / density))
+    return BoidsConfig(num_boids=num_boids, screen_size=screen_size, dtype=dtype, seed=0, **overrides)
+
+
+def bench_case(config: BoidsConfig, steps: int, time_budget: float,
+               render: bool = True) -> Dict:
+    """
+    测量单个配置
+    Args:
+        config: 模拟配置
+        steps: 最大计时步数
+        time_budget: 单个配置计时阶段的时间上限（秒），至少运行3步
+        render: 是否同时测量点溅射渲染耗时
+    Returns:
+        result: 计时与内存统计
+    """
+    start = time.perf_counter()
+    system = BoidsSystem(config)
+    init_time = time.perf_counter() - start
+
+    system.update()  # 预热（首次构建邻居表等）
+    timer = _PhaseTimer(system)
+    step_times = []
+    while len(step_times) < steps and (len(step_times) < 3 or sum(step_times) < time_budget):
+        start = time.perf_counter()
+        system.update()
+        step_times.append(time.perf_counter() - start)
+
+    total = sum(step_times)
+    measured = len(step_times)
+    phases = {phase: t / measured for phase, t in timer.totals.items()}
+    phases["other"] = max(total / measured - sum(phases.values()), 0.0)
+
+    result = {
+        "num_boids": config.num_boids,
+        "density": config.num_boids / config.screen_size ** 2,
+        "dtype": config.dtype,
+        "config": asdict(config),
+        "steps": measured,
+        "init_seconds": init_time,
+        "step_seconds_mean": total / measured,
+        "step_seconds_min": min(step_times),
+        "steps_per_second": measured / total if total > 0 else float("inf"),
+        "phase_seconds": phases,
+        "neighbor_list": system.neighbor_list_stats(),
+    }
+    if render:
+        from headless import PointSplatRenderer
+        renderer = PointSplatRenderer(config.screen_size, max_speed=config.max_speed)
+        speeds = np.linalg.norm(system.velocities, axis=1)
+        start = time.perf_counter()
+        renderer.render(system.positions, speeds)
+        result["render_seconds"] = time.perf_counter() - start
+    del system
+
+    # 峰值内存单独测量，避免tracemalloc开销影响计时
+    tracemalloc.start()
+    try:
+        system = BoidsSystem(config)
+        system.update()
+        result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def format_result(result: Dict) -> str:
+    """单个配置结果的一行摘要"""
+    return (f"N={result['num_boids']:>8} density={result['density']:<8.4g} dtype={result['dtype']:<8} "
+            f"{result['steps_per_second']:10.2f} 步/秒  "
+            f"峰值内存 {result['peak_memory_bytes'] / 2**20:8.1f} MiB  "
+            + " ".join(f"{k}={v * 1e3:.2f}ms" for k, v in result["phase_seconds"].items()))
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       cwd=Path(__file__).parent, stderr=subprocess.DEVNULL,
+                                       text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes: List[int], densities: List[float], dtypes: List[str],
+                   steps: int = 20, time_budget: float = 10.0, render: bool = True,
+                   **overrides) -> Dict:
+    """
+    运行完整基准矩阵
+    Returns:
+        report: 含环境元数据与各配置结果的字典
+    """
+    results = []
+    for dtype in dtypes:
+        for density in densities:
+            for n in sizes:
+                config = make_config(n, density, dtype, **overrides)
+                result = bench_case(config, steps, time_budget, render)
+                results.append(result)
+                logger.info(format_result(result))
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def _case_key(result: Dict) -> tuple:
+    return result["num_boids"], round(result["density"], 6), result["dtype"]
+
+
+def compare_reports(baseline: Dict, current: Dict) -> List[Dict]:
+    """
+    对比两次基准结果
+    Returns:
+        rows: 每个共同配置的步速率与加速比
+    """
+    base_index = {_case_key(r): r for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        base = base_index.get(_case_key(result))
+        if base is None:
+            continue
+        rows.append({
+            "num_boids": result["num_boids"],
+            "density": result["density"],
+            "dtype": result["dtype"],
+            "baseline_steps_per_second": base["steps_per_second"],
+            "current_steps_per_second": result["steps_per_second"],
+            "speedup": result["steps_per_second"] / base["steps_per_second"],
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BoidsSystem性能基准")
+    parser.add_argument("--sizes", default="100,1000,10000,100000,1000000", help="粒子数列表")
+    parser.add_argument("--densities", default="0.25,1.0", help="粒子密度列表（每单位面积）")
+    parser.add_argument("--dtypes", default="float64,float32", help="精度列表")
+    parser.add_argument("--steps", type=int, default=20, help="每个配置的最大计时步数")
+    parser.add_argument("--time-budget", type=float, default=10.0, help="每个配置的计时时间上限（秒）")
+    parser.add_argument("--verlet-skin", type=float, default=0.0)
+    parser.add_argument("--no-render", action="store_true", help="跳过渲染计时")
+    parser.add_argument("--output", type=Path, default=None, help="结果JSON路径")
+    parser.add_argument("--compare", type=Path, default=None, help="用于对比的基线JSON")
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        sizes=[int(v) for v in args.sizes.split(",")],
+        densities=[float(v) for v in args.densities.split(",")],
+        dtypes=args.dtypes.split(","),
+        steps=args.steps,
+        time_budget=args.time_budget,
+        render=not args.no_render,
+        verlet_skin=args.verlet_skin,
+    )
+    for result in report["results"]:
+        print(format_result(result))
+    output = args.output or RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"基准结果已保存至 {output}")
+
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline_report = json.load(f)
+        for row in compare_reports(baseline_report, report):
+            print(f"N={row['num_boids']:>8} density={row['density']:<8.4g} dtype={row['dtype']:<8} "
+                  f"{row['baseline_steps_per_second']:10.2f} -> {row['current_steps_per_second']:10.2f} 步/秒 "
+                  f"(x{row['speedup']:.2f})")
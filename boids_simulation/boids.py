@@ -3,11 +3,17 @@
 基于Boids算法实现高可靠、可扩展的群体行为模拟
 """
 
-from typing import Tuple
+from typing import Optional, Tuple
 import numpy as np
 import logging
+import time
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, fields
+
+from spatial import CellList, VerletList, dense_pairs, minimum_image
+from initialization import initial_positions, initial_velocities
+from checkpoint import AsyncCheckpointWriter, read_checkpoint, write_checkpoint
+from metrics import MetricsRingBuffer
 
 # 类型别名定义
 Vector2D = Tuple[float, float]
@@ -25,6 +31,36 @@ class BoidsConfig:
     cohesion_factor: float = 0.01  # 聚合因子
     separation_factor: float = 0.05  # 分离因子
     dt: float = 0.1             # 时间步长
+    neighbor_search: str = "cell_list"  # 邻居搜索方式: "cell_list" 或 "dense"
+    verlet_skin: float = 0.0    # Verlet邻居表表皮层厚度（0表示禁用）
+    dtype: str = "float64"      # 状态数组精度: "float64" 或 "float32"
+    seed: Optional[int] = None  # 随机种子（为空时使用系统熵）
+    init_layout: str = "halton"  # 初始布局: "halton"、"sobol" 或 "random"
+    metrics_capacity: int = 1024  # 指标环形缓冲容量（步）
+    metrics_every: int = 1      # 指标采样间隔（步），0表示不采集
+    log_every: int = 100        # 聚合指标写入日志的间隔（步），0表示不写日志
+
+class BoidsWorkspace:
+    """单步更新所需的预分配缓冲区，避免每步重复申请内存"""
+
+    def __init__(self, num_boids: int, dtype: np.dtype, batch_shape: Tuple[int, ...] = ()):
+        """
+        按粒子数量分配缓冲区
+        Args:
+            num_boids: 粒子数量
+            dtype: 缓冲区数值精度
+            batch_shape: 批量维度（集成模拟时为 (K,)）
+        """
+        vec_shape = batch_shape + (num_boids, 2)
+        self.separation = np.zeros(vec_shape, dtype=dtype)              # 分离力
+        self.alignment = np.empty(vec_shape, dtype=dtype)               # 对齐力
+        self.cohesion = np.empty(vec_shape, dtype=dtype)                # 聚合力
+        self.force = np.empty(vec_shape, dtype=dtype)                   # 合力/位移增量
+        self.speed = np.empty(batch_shape + (num_boids,), dtype=dtype)  # 速率
+        self.scale = np.empty(batch_shape + (num_boids,), dtype=dtype)  # 限速缩放系数
+        self.inv_speed = np.zeros(batch_shape + (num_boids,), dtype=dtype)  # 速率倒数（静止粒子为0）
+        self.moving = np.empty(batch_shape + (num_boids,), dtype=bool)      # 速率非零掩码
+        self.mean = np.empty(batch_shape + (1, 2), dtype=dtype)         # 群体均值
 
 class BoidsSystem:
     """工业级群体行为模拟引擎"""
@@ -36,95 +72,368 @@ class BoidsSystem:
             config: 系统配置参数
         """
         self.cfg = config
+        self.dtype = np.dtype(config.dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError(f"不支持的数值精度: {config.dtype}")
         self._init_particles()
+        self.workspace = BoidsWorkspace(config.num_boids, self.dtype, self.positions.shape[:-2])
+        self._init_neighbor_search()
         self.logger = self._configure_logger()
+        self.step_count = 0
+        self.metrics_history = MetricsRingBuffer(config.metrics_capacity)
+        self._mean_neighbors = np.nan
+        self._checkpoint_writer: Optional[AsyncCheckpointWriter] = None
+        self._checkpoint_every = 0
         
     def _init_particles(self) -> None:
         """初始化粒子状态"""
-        # 使用Halton序列实现确定性初始化[2](@ref)
+        # 使用低差异序列实现确定性初始化[2](@ref)
         n = self.cfg.num_boids
-        self.positions = self._halton_sequence(n) * self.cfg.screen_size
-        self.velocities = np.random.normal(0, 0.1, (n, 2))
+        self.rng = np.random.default_rng(self.cfg.seed)
+        self.positions = initial_positions(
+            n, self.cfg.screen_size, self.cfg.init_layout, self.rng, self.dtype)
+        self.velocities = initial_velocities(n, self.rng, dtype=self.dtype)
         
-    def _halton_sequence(self, n: int) -> np.ndarray:
-        """生成低差异序列确保均匀分布"""
-        def _halton(index: int, base: int):
-            result = 0.0
-            f = 1.0
-            i = index
-            while i > 0:
-                f /= base
-                result += f * (i % base)
-                i = i // base
-            return result
-            
-        return np.array([(_halton(i,2), _halton(i,3)) for i in range(1, n+1)])
-    
+    def _init_neighbor_search(self) -> None:
+        """根据配置选择邻居搜索引擎（网格过粗时退化为稠密计算）"""
+        if self.cfg.neighbor_search not in ("cell_list", "dense"):
+            raise ValueError(f"未知的邻居搜索方式: {self.cfg.neighbor_search}")
+        self.cell_list = None
+        self.verlet_list = None
+        if self.cfg.verlet_skin > 0:
+            self.verlet_list = VerletList(
+                self.cfg.screen_size, self.cfg.separation_dist, self.cfg.verlet_skin)
+        elif self.cfg.neighbor_search == "cell_list" and CellList.supports(
+                self.cfg.screen_size, self.cfg.separation_dist):
+            self.cell_list = CellList(self.cfg.screen_size, self.cfg.separation_dist)
+
+    def neighbor_list_stats(self) -> dict:
+        """
+        返回Verlet邻居表的重建统计
+        Returns:
+            stats: 包含查询次数、重建次数与重建比例的字典（未启用时为空）
+        """
+        if self.verlet_list is None:
+            return {}
+        return {
+            "queries": self.verlet_list.queries,
+            "rebuilds": self.verlet_list.rebuilds,
+            "rebuild_ratio": self.verlet_list.rebuild_ratio,
+        }
+
+    def order_parameters(self) -> dict:
+        """
+        计算群体序参量
+        Returns:
+            metrics: 包含以下键的字典
+                mean_speed: 平均速率
+                polarization: 极化序参量 |<v/|v|>|，1表示完全同向
+                clustering: 平均邻居数与均匀分布期望值之比，大于1表示聚集
+        """
+        return {key: float(value[0]) for key, value in self._flock_order_parameters().items()}
+
+    def _flock_order_parameters(self, groups: Optional[np.ndarray] = None) -> dict:
+        """
+        逐群体计算序参量（多副本系统按副本分别归约，邻居对不跨副本）
+        Args:
+            groups: 展平粒子的副本编号 (B*N,)，单一系统时为空
+        Returns:
+            metrics: 字段同 order_parameters，每项为 (B,) 数组
+        """
+        n = self.cfg.num_boids
+        velocities = self.velocities.reshape(-1, n, 2)
+        speed = np.linalg.norm(velocities, axis=-1)
+        heading = velocities / np.maximum(speed, np.finfo(self.dtype).tiny)[..., np.newaxis]
+
+        positions = self.positions.reshape(-1, 2)
+        if CellList.supports(self.cfg.screen_size, self.cfg.separation_dist):
+            i, _ = CellList(self.cfg.screen_size, self.cfg.separation_dist).query_pairs(positions, groups)
+        else:
+            i, _ = dense_pairs(positions, self.cfg.screen_size, self.cfg.separation_dist, groups)
+        pairs = np.bincount(i // n, minlength=len(velocities))
+        expected = (n - 1) * np.pi * self.cfg.separation_dist ** 2 / self.cfg.screen_size ** 2
+        return {
+            "mean_speed": speed.mean(axis=-1),
+            "polarization": np.linalg.norm(heading.mean(axis=-2), axis=-1),
+            "clustering": pairs / n / expected if n > 1 else np.zeros(len(velocities)),
+        }
+
+    def state_dict(self) -> dict:
+        """
+        导出可完整恢复运行的状态快照（数组均为拷贝）
+        Returns:
+            state: 位置、速度、步数、随机数生成器状态、配置及邻居表状态
+        """
+        state = {
+            "positions": self.positions.copy(),
+            "velocities": self.velocities.copy(),
+            "step_count": self.step_count,
+            "rng_state": self._rng_state(),
+            "config": asdict(self.cfg),
+        }
+        if self.verlet_list is not None:
+            state.update(self.verlet_list.state_dict())
+        return state
+
+    def _rng_state(self):
+        """随机数生成器状态（可JSON序列化）"""
+        return self.rng.bit_generator.state
+
+    def _restore_rng_state(self, rng_state) -> None:
+        self.rng.bit_generator.state = rng_state
+
+    def load_state_dict(self, state: dict) -> None:
+        """
+        从状态快照恢复运行状态
+        Args:
+            state: 由 state_dict 或 read_checkpoint 得到的状态
+        """
+        if state["positions"].shape != self.positions.shape:
+            raise ValueError(f"检查点粒子形状 {state['positions'].shape} 与系统 {self.positions.shape} 不一致")
+        self.positions[...] = state["positions"]
+        self.velocities[...] = state["velocities"]
+        self.step_count = int(state["step_count"])
+        self._restore_rng_state(state["rng_state"])
+        if self.verlet_list is not None:
+            self.verlet_list.load_state_dict(state)
+
+    def save_checkpoint(self, path: Path, background: bool = False) -> None:
+        """
+        保存检查点
+        Args:
+            path: 检查点文件路径
+            background: 是否在后台线程中写入
+        """
+        if background:
+            if self._checkpoint_writer is None or self._checkpoint_writer.path != Path(path):
+                self._checkpoint_writer = AsyncCheckpointWriter(path)
+            self._checkpoint_writer.submit(self.state_dict())
+        else:
+            write_checkpoint(path, self.state_dict())
+
+    def enable_checkpointing(self, path: Path, every: int) -> None:
+        """
+        开启周期性后台检查点
+        Args:
+            path: 检查点文件路径
+            every: 每隔多少步写入一次
+        """
+        if every < 1:
+            raise ValueError(f"检查点间隔必须为正整数: {every}")
+        self._checkpoint_writer = AsyncCheckpointWriter(path)
+        self._checkpoint_every = every
+
+    def wait_for_checkpoint(self) -> None:
+        """等待进行中的后台检查点写入完成"""
+        if self._checkpoint_writer is not None:
+            self._checkpoint_writer.wait()
+
+    def _record_metrics(self, step_time: float) -> None:
+        """
+        采集本步标量指标写入环形缓冲（复用工作区缓冲，不分配N规模数组）
+        Args:
+            step_time: 本步耗时（秒）
+        """
+        ws = self.workspace
+        velocities = self.velocities.reshape(-1, self.cfg.num_boids, 2)
+        speed = ws.speed.reshape(-1, self.cfg.num_boids)
+        inv_speed = ws.inv_speed.reshape(-1, self.cfg.num_boids)
+        moving = ws.moving.reshape(-1, self.cfg.num_boids)
+        np.einsum('...j,...j->...', velocities, velocities, out=speed)
+        np.sqrt(speed, out=speed)
+        np.greater(speed, 0, out=moving)
+        # where= 跳过的位置保留原值，先清零使静止粒子的倒数为0
+        inv_speed.fill(0)
+        np.divide(1.0, speed, out=inv_speed, where=moving)
+        # 各群体的单位速度向量之和 (B,2)，对多副本系统取各副本极化的均值
+        heading_sum = np.einsum('bn,bnk->bk', inv_speed, velocities)
+        polarization = np.linalg.norm(heading_sum, axis=-1).mean() / self.cfg.num_boids
+        self.metrics_history.record(self.step_count, step_time, speed.mean(),
+                                    polarization, self._mean_neighbors)
+
+    def _flush_metrics_log(self) -> None:
+        """将最近一个日志周期的聚合指标写入日志"""
+        window = self.metrics_history.aggregate(last=max(1, self.cfg.log_every // max(1, self.cfg.metrics_every)))
+        if window:
+            self.logger.info(
+                f"Step {self.step_count}: mean speed {window['mean_speed']:.3f}, "
+                f"polarization {window['polarization']:.3f}, neighbors {window['mean_neighbors']:.2f}, "
+                f"step time {window['step_time'] * 1e3:.3f} ms")
+
+    def latest_metrics(self, last: Optional[int] = None) -> dict:
+        """
+        实时看板访问接口
+        Args:
+            last: 返回最近 last 条历史，为空时仅返回最新一条
+        Returns:
+            metrics: 最新指标字典，或字段名到历史数组的映射
+        """
+        if last is None:
+            return self.metrics_history.latest()
+        return self.metrics_history.snapshot(last)
+
+    def _after_step(self, step_time: float = np.nan) -> None:
+        """步进完成后的计数、指标采集、抽样日志与周期性检查点"""
+        self.step_count += 1
+        if self.cfg.metrics_every and self.step_count % self.cfg.metrics_every == 0:
+            self._record_metrics(step_time)
+        if self.cfg.log_every and self.step_count % self.cfg.log_every == 0:
+            self._flush_metrics_log()
+        if self._checkpoint_every and self.step_count % self._checkpoint_every == 0:
+            self._checkpoint_writer.submit(self.state_dict())
+
+    @classmethod
+    def from_checkpoint(cls, path: Path) -> "BoidsSystem":
+        """
+        由检查点文件构造系统并恢复状态，后续演化与中断前逐位一致
+        Args:
+            path: 检查点文件路径
+        Returns:
+            system: 恢复后的系统实例
+        """
+        state = read_checkpoint(path)
+        known = {f.name for f in fields(BoidsConfig)}
+        config = BoidsConfig(**{k: v for k, v in state["config"].items() if k in known})
+        system = cls(config)
+        system.load_state_dict(state)
+        return system
+
     def _configure_logger(self) -> logging.Logger:
         """配置工业级日志系统"""
         logger = logging.getLogger('BoidsSystem')
         logger.setLevel(logging.INFO)
-        handler = logging.FileHandler(Path('logs') / 'simulation.log')
-        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-        logger.addHandler(handler)
+        # 多实例（如集成或扫描）共享同一处理器，避免日志重复写入
+        if not logger.handlers:
+            Path('logs').mkdir(exist_ok=True)
+            handler = logging.FileHandler(Path('logs') / 'simulation.log')
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+            logger.addHandler(handler)
         return logger
     
     def _apply_periodic_boundary(self) -> None:
         """应用周期性边界条件[6,7](@ref)"""
-        self.positions %= self.cfg.screen_size
+        np.remainder(self.positions, self.cfg.screen_size, out=self.positions)
         
     def _calculate_separation(self) -> np.ndarray:
         """
-        计算分离作用力（修复广播错误）
+        计算分离作用力
+        Returns:
+            separation_forces: 分离力向量 (N,2)
+        """
+        if self.verlet_list is None and self.cell_list is None:
+            return self._calculate_separation_dense()
+        i, j = self._query_neighbor_pairs()
+        return self._separation_from_pairs(i, j)
+
+    def _query_neighbor_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """从Verlet邻居表或网格检索候选邻居对"""
+        search = self.verlet_list if self.verlet_list is not None else self.cell_list
+        return search.query_pairs(self.positions)
+
+    def _separation_from_pairs(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        """
+        由候选邻居索引对累加分离向量
+        Args:
+            i, j: 候选有序粒子对，按展平后的粒子下标（超出分离阈值的对在此处剔除）
+        Returns:
+            separation_forces: 分离力向量，写入工作区缓冲
+        """
+        positions = self.positions.reshape(-1, 2)
+        out = self.workspace.separation.reshape(-1, 2)
+        n = len(positions)
+        delta_pos = minimum_image(positions[i] - positions[j], self.cfg.screen_size)
+        within = np.einsum('ij,ij->i', delta_pos, delta_pos) < self.cfg.separation_dist ** 2
+        i, delta_pos = i[within], delta_pos[within]
+
+        # 按粒子聚合邻居位移与邻居数量（避免除零）
+        neighbor_counts = np.bincount(i, minlength=n)
+        self._mean_neighbors = len(i) / n
+        np.maximum(neighbor_counts, 1, out=neighbor_counts)
+        out[:, 0] = np.bincount(i, weights=delta_pos[:, 0], minlength=n)
+        out[:, 1] = np.bincount(i, weights=delta_pos[:, 1], minlength=n)
+        np.divide(out, neighbor_counts[:, np.newaxis], out=out)
+        out *= self.cfg.separation_factor
+        return self.workspace.separation
+
+    def _calculate_separation_dense(self) -> np.ndarray:
+        """
+        稠密O(N²)分离力计算，作为小规模或粗网格时的参考实现
         Returns:
             separation_forces: 分离力向量 (N,2)
         """
-        # 计算粒子间相对位置差
-        delta_pos = self.positions[:, np.newaxis] - self.positions  # 形状: (N,N,2)
-        distances = np.linalg.norm(delta_pos, axis=2)  # 形状: (N,N)
+        # 计算粒子间相对位置差（周期边界下取最近镜像）
+        delta_pos = self.positions[..., :, np.newaxis, :] - self.positions[..., np.newaxis, :, :]  # 形状: (...,N,N,2)
+        minimum_image(delta_pos, self.cfg.screen_size)
+        distances = np.linalg.norm(delta_pos, axis=-1)  # 形状: (...,N,N)
         
         # 构建分离作用掩码（排除自身）
         mask = (distances < self.cfg.separation_dist) & ~np.eye(self.cfg.num_boids, dtype=bool)
         
         # 计算有效邻居数量（避免除零）
-        neighbor_counts = np.maximum(mask.sum(axis=1), 1)
+        neighbor_counts = mask.sum(axis=-1)
+        self._mean_neighbors = neighbor_counts.mean()
+        np.maximum(neighbor_counts, 1, out=neighbor_counts)
         
         # 加权平均分离向量
-        separation_vectors = (delta_pos * mask[:, :, np.newaxis]).sum(axis=1)
-        return separation_vectors / neighbor_counts[:, np.newaxis] * self.cfg.separation_factor
+        out = self.workspace.separation
+        np.einsum('...ijk,...ij->...ik', delta_pos, mask, out=out)
+        np.divide(out, neighbor_counts[..., np.newaxis], out=out)
+        out *= self.cfg.separation_factor
+        return out
     
     def _calculate_alignment(self) -> np.ndarray:
-        """计算对齐作用力"""
-        avg_velocity = np.mean(self.velocities, axis=0)
-        return (avg_velocity - self.velocities) * self.cfg.alignment_factor
+        """计算对齐作用力（写入工作区缓冲）"""
+        ws = self.workspace
+        avg_velocity = np.mean(self.velocities, axis=-2, keepdims=True, out=ws.mean)
+        np.subtract(avg_velocity, self.velocities, out=ws.alignment)
+        ws.alignment *= self.cfg.alignment_factor
+        return ws.alignment
     
     def _calculate_cohesion(self) -> np.ndarray:
-        """计算聚合作用力"""
-        center = np.mean(self.positions, axis=0)
-        return (center - self.positions) * self.cfg.cohesion_factor
+        """计算聚合作用力（写入工作区缓冲）"""
+        ws = self.workspace
+        center = np.mean(self.positions, axis=-2, keepdims=True, out=ws.mean)
+        np.subtract(center, self.positions, out=ws.cohesion)
+        ws.cohesion *= self.cfg.cohesion_factor
+        return ws.cohesion
+
+    def _clamp_speed(self) -> None:
+        """原地将超速粒子的速度缩放至最大速度"""
+        ws = self.workspace
+        np.einsum('...j,...j->...', self.velocities, self.velocities, out=ws.speed)
+        np.sqrt(ws.speed, out=ws.speed)
+        # 缩放系数 = max_speed / max(speed, max_speed)，未超速粒子系数为1
+        np.maximum(ws.speed, self.cfg.max_speed, out=ws.scale)
+        np.divide(self.cfg.max_speed, ws.scale, out=ws.scale)
+        self.velocities *= ws.scale[..., np.newaxis]
     
     def update(self) -> None:
         """执行系统状态更新"""
         try:
-            # 计算各类作用力
+            start = time.perf_counter()
+            ws = self.workspace
+
+            # 计算各类作用力（结果均位于工作区缓冲）
             sep_force = self._calculate_separation()
             ali_force = self._calculate_alignment()
             coh_force = self._calculate_cohesion()
             
             # 综合作用力更新速度
-            self.velocities += (sep_force + ali_force + coh_force) * self.cfg.dt
+            np.add(sep_force, ali_force, out=ws.force)
+            ws.force += coh_force
+            ws.force *= self.cfg.dt
+            self.velocities += ws.force
             
             # 应用速度限制
-            speed = np.linalg.norm(self.velocities, axis=1)
-            overspeed = speed > self.cfg.max_speed
-            self.velocities[overspeed] = (self.velocities[overspeed].T / speed[overspeed]).T * self.cfg.max_speed
+            self._clamp_speed()
             
             # 更新位置并处理边界
-            self.positions += self.velocities * self.cfg.dt
+            np.multiply(self.velocities, self.cfg.dt, out=ws.force)
+            self.positions += ws.force
             self._apply_periodic_boundary()
             
-            # 记录关键指标
-            self.logger.info(f"Average velocity: {np.mean(self.velocities):.2f}")
+            # 记录关键指标（写入环形缓冲，按间隔聚合写日志）
+            self._after_step(time.perf_counter() - start)
             
         except Exception as e:
             self.logger.error(f"Update failed: {str(e)}")
@@ -0,0 +1,109 @@
+"""
+检查点读写模块
+将模拟状态以紧凑的 .npz 二进制格式原子写入磁盘，并提供后台写入线程避免阻塞主循环
+"""
+
+from typing import Dict, Optional
+from pathlib import Path
+import json
+import logging
+import os
+import threading
+import numpy as np
+
+# 检查点格式版本
+CHECKPOINT_VERSION = 1
+
+# 以JSON序列化保存的非数组字段
+_JSON_FIELDS = ("config", "rng_state", "extra")
+
+logger = logging.getLogger('BoidsCheckpoint')
+
+
+def write_checkpoint(path: Path, state: Dict) -> Path:
+    """
+    原子写入检查点：先写入同目录临时文件并落盘，再替换目标文件
+    Args:
+        path: 检查点文件路径
+        state: 状态字典，数组字段直接保存，config / rng_state / extra 以JSON保存
+    Returns:
+        path: 写入完成的检查点路径
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": np.array(CHECKPOINT_VERSION)}
+    for key, value in state.items():
+        if key in _JSON_FIELDS:
+            payload[key] = np.array(json.dumps(value))
+        else:
+            payload[key] = np.asarray(value)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_checkpoint(path: Path) -> Dict:
+    """
+    读取检查点
+    Args:
+        path: 检查点文件路径
+    Returns:
+        state: 与写入时结构一致的状态字典
+    """
+    with np.load(Path(path), allow_pickle=False) as data:
+        version = int(data["version"])
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"不支持的检查点版本: {version}")
+        state = {}
+        for key in data.files:
+            if key == "version":
+                continue
+            state[key] = json.loads(str(data[key])) if key in _JSON_FIELDS else data[key]
+    return state
+
+
+class AsyncCheckpointWriter:
+    """后台检查点写入线程，主循环仅负责拷贝状态快照"""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: 检查点文件路径（每次写入覆盖为最新状态）
+        """
+        self.path = Path(path)
+        self.completed = 0
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def _run(self, state: Dict) -> None:
+        try:
+            write_checkpoint(self.path, state)
+            self.completed += 1
+        except Exception as e:  # 错误在下一次提交或等待时抛出
+            self._error = e
+            logger.error(f"检查点写入失败: {str(e)}")
+
+    def submit(self, state: Dict) -> None:
+        """
+        提交状态快照进行后台写入（上一次写入未完成时先等待其结束）
+        Args:
+            state: 已与运行状态解耦的状态快照
+        """
+        self.wait()
+        self._thread = threading.Thread(target=self._run, args=(state,),
+                                        name="CheckpointWriter", daemon=True)
+        self._thread.start()
+
+    def wait(self) -> None:
+        """等待当前写入完成"""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("检查点写入失败") from error
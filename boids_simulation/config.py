@@ -1,6 +1,7 @@
 from pathlib import Path
 from loguru import logger
 from dataclasses import dataclass
+from typing import Optional
 
 # 路径配置
 BASE_DIR = Path(__file__).parent
@@ -39,4 +40,12 @@ class BoidsConfig:
     alignment_factor: float = 0.1  # 对齐因子
     cohesion_factor: float = 0.01  # 聚合因子
     separation_factor: float = 0.05  # 分离因子
-    dt: float = 0.1             # 时间步长
\ No newline at end of file
+    dt: float = 0.1             # 时间步长
+    neighbor_search: str = "cell_list"  # 邻居搜索方式: "cell_list" 或 "dense"
+    verlet_skin: float = 0.0    # Verlet邻居表表皮层厚度（0表示禁用）
+    dtype: str = "float64"      # 状态数组精度: "float64" 或 "float32"
+    seed: Optional[int] = None  # 随机种子（为空时使用系统熵）
+    init_layout: str = "halton"  # 初始布局: "halton"、"sobol" 或 "random"
+    metrics_capacity: int = 1024  # 指标环形缓冲容量（步）
+    metrics_every: int = 1      # 指标采样间隔（步），0表示不采集
+    log_every: int = 100        # 聚合指标写入日志的间隔（步），0表示不写日志
\ No newline at end of file
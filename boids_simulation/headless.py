@@ -0,0 +1,303 @@
+"""
+无界面高吞吐渲染模块
+脱离GUI事件循环推进模拟，直接由画布RGBA缓冲或NumPy点溅射光栅化帧，
+并由后台写入线程将帧流式输出至视频编码器或滚动图像序列
+"""
+
+from typing import Optional, Tuple
+from pathlib import Path
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import numpy as np
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgb
+from PIL import Image
+from loguru import logger
+
+from config import BoidsConfig, FIGURES_DIR
+from boids import BoidsSystem
+
+# 类型别名定义
+RGBFrame = np.ndarray  # 形状: (H,W,3), dtype=uint8
+
+
+class PointSplatRenderer:
+    """纯NumPy点溅射渲染器，按速度着色并在周期边界处环绕"""
+
+    def __init__(self, screen_size: float, resolution: int = 800, radius: int = 2,
+                 max_speed: float = 2.0, background: str = '#1a1a1a', cmap: str = 'viridis'):
+        """
+        初始化渲染参数
+        Args:
+            screen_size: 模拟区域尺寸
+            resolution: 输出图像边长（像素）
+            radius: 粒子圆点半径（像素）
+            max_speed: 颜色映射的速度上限
+            background: 背景颜色
+            cmap: 速度颜色映射名称
+        """
+        self.screen_size = screen_size
+        self.resolution = resolution
+        self.max_speed = max_speed
+        self.background = np.array(to_rgb(background)) * 255
+        self.lut = (matplotlib.colormaps[cmap](np.linspace(0, 1, 256))[:, :3] * 255).astype(np.uint8)
+        # 圆盘模板偏移
+        dy, dx = np.mgrid[-radius:radius + 1, -radius:radius + 1]
+        disc = dx ** 2 + dy ** 2 <= radius ** 2
+        self.offsets = np.stack([dy[disc], dx[disc]], axis=1)
+        self.frame = np.empty((resolution, resolution, 3), dtype=np.uint8)
+
+    def render(self, positions: np.ndarray, speeds: Optional[np.ndarray] = None) -> RGBFrame:
+        """
+        光栅化一帧（复用内部缓冲，调用方需在下次渲染前消费或复制）
+        Args:
+            positions: 粒子位置 (N,2)
+            speeds: 粒子速率 (N,)，为空时统一使用颜色映射中值
+        Returns:
+            frame: RGB图像 (H,W,3)
+        """
+        res = self.resolution
+        self.frame[...] = self.background
+        px = (positions[:, 0] * (res / self.screen_size)).astype(np.intp)
+        py = res - 1 - (positions[:, 1] * (res / self.screen_size)).astype(np.intp)
+        if speeds is None:
+            colors = self.lut[128]
+        else:
+            idx = np.clip(speeds * (255 / self.max_speed), 0, 255).astype(np.intp)
+            colors = self.lut[idx]
+
+        flat = self.frame.reshape(-1, 3)
+        for dy, dx in self.offsets:
+            flat[((py + dy) % res) * res + (px + dx) % res] = colors
+        return self.frame
+
+
+class CanvasRenderer:
+    """基于Agg画布的散点渲染器（无GUI），直接读取RGBA缓冲"""
+
+    def __init__(self, cfg: BoidsConfig, figsize: float = 8.0, dpi: int = 100):
+        """
+        构建离屏画布
+        Args:
+            cfg: 群体行为配置参数
+            figsize: 图像尺寸（英寸）
+            dpi: 分辨率
+        """
+        self.fig = Figure(figsize=(figsize, figsize), dpi=dpi, facecolor='#1a1a1a')
+        self.canvas = FigureCanvasAgg(self.fig)
+        ax = self.fig.add_axes((0, 0, 1, 1))
+        ax.set_facecolor('#1a1a1a')
+        ax.set_xlim(0, cfg.screen_size)
+        ax.set_ylim(0, cfg.screen_size)
+        ax.set_axis_off()
+        self.scatter = ax.scatter([], [], c=[], s=35, alpha=0.7, edgecolor='w', linewidth=0.3,
+                                  cmap='viridis', norm=matplotlib.colors.Normalize(0, cfg.max_speed))
+
+    def render(self, positions: np.ndarray, speeds: Optional[np.ndarray] = None) -> RGBFrame:
+        """更新散点并光栅化，返回画布RGBA缓冲的RGB视图（下次渲染时被覆盖）"""
+        self.scatter.set_offsets(positions)
+        if speeds is not None:
+            self.scatter.set_array(speeds)
+        self.canvas.draw()
+        return np.asarray(self.canvas.buffer_rgba())[..., :3]
+
+
+class ImageSequenceSink:
+    """滚动图像序列输出，仅保留最近 max_files 帧"""
+
+    def __init__(self, directory: Path = FIGURES_DIR, prefix: str = "sim_frame",
+                 max_files: Optional[int] = None, image_format: str = "png"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_files = max_files
+        self.image_format = image_format
+        self._written = []
+
+    def write(self, index: int, frame: RGBFrame) -> None:
+        """写入单帧，超出保留数量时删除最旧文件"""
+        path = self.directory / f"{self.prefix}_{index:06d}.{self.image_format}"
+        # PNG使用低压缩级别以换取写入速度
+        options = {"compress_level": 1} if self.image_format == "png" else {}
+        Image.fromarray(frame).save(path, **options)
+        self._written.append(path)
+        if self.max_files is not None and len(self._written) > self.max_files:
+            self._written.pop(0).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        pass
+
+
+class FFmpegSink:
+    """通过ffmpeg标准输入管道编码视频或GIF（按输出扩展名自动选择格式）"""
+
+    def __init__(self, output_path: Path, fps: int = 30):
+        if shutil.which("ffmpeg") is None:
+            raise RuntimeError("未找到ffmpeg可执行文件，无法进行视频编码")
+        self.output_path = Path(output_path)
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self.fps = fps
+        self._proc = None
+
+    def _start(self, shape: Tuple[int, int]) -> None:
+        """根据首帧尺寸启动编码进程"""
+        height, width = shape
+        cmd = ["ffmpeg", "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}",
+               "-r", str(self.fps), "-i", "-"]
+        if self.output_path.suffix.lower() != ".gif":
+            cmd += ["-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+        cmd.append(str(self.output_path))
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def write(self, index: int, frame: RGBFrame) -> None:
+        if self._proc is None:
+            self._start(frame.shape[:2])
+        self._proc.stdin.write(np.ascontiguousarray(frame).tobytes())
+
+    def close(self) -> None:
+        if self._proc is not None:
+            self._proc.stdin.close()
+            if self._proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg编码失败，返回码 {self._proc.returncode}")
+            self._proc = None
+
+
+class AsyncFrameWriter:
+    """后台写入线程，通过有界队列与模拟主循环解耦"""
+
+    def __init__(self, sink, max_queue: int = 32, drop_when_full: bool = False):
+        """
+        启动写入线程
+        Args:
+            sink: 提供 write(index, frame) / close() 的输出端
+            max_queue: 队列容量上限
+            drop_when_full: 队列满时丢弃新帧（否则阻塞主循环）
+        """
+        self.sink = sink
+        self.drop_when_full = drop_when_full
+        self.dropped_frames = 0
+        self.written_frames = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="FrameWriter", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                self.sink.write(*item)
+                self.written_frames += 1
+            except Exception as e:  # 错误在主线程下一次提交时抛出
+                self._error = e
+                logger.error(f"帧写入失败: {str(e)}")
+
+    def submit(self, index: int, frame: RGBFrame) -> None:
+        """提交一帧（帧数据需由调用方保证不再被修改）"""
+        if self._closed:
+            raise RuntimeError("帧写入器已关闭")
+        if self._error is not None:
+            raise RuntimeError("帧写入线程异常") from self._error
+        if self.drop_when_full:
+            try:
+                self._queue.put_nowait((index, frame))
+            except queue.Full:
+                self.dropped_frames += 1
+        else:
+            self._queue.put((index, frame))
+
+    def close(self) -> None:
+        """等待队列清空并关闭输出端（重复调用无副作用）"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self.sink.close()
+        if self._error is not None:
+            raise RuntimeError("帧写入线程异常") from self._error
+
+
+class HeadlessSimulation:
+    """无GUI的模拟与渲染驱动器"""
+
+    def __init__(self, config: BoidsConfig, renderer: str = "splat",
+                 writer: Optional[AsyncFrameWriter] = None, resolution: int = 800):
+        """
+        Args:
+            config: 群体行为配置参数
+            renderer: "splat"（NumPy点溅射）或 "canvas"（Agg画布缓冲）
+            writer: 后台帧写入器，为空时仅模拟不输出
+            resolution: 输出图像边长（像素）
+        """
+        self.cfg = config
+        self.system = BoidsSystem(config)
+        self.writer = writer
+        self.frames = 0  # 累计提交帧数，多次 run 之间连续编号
+        if renderer == "splat":
+            self.renderer = PointSplatRenderer(config.screen_size, resolution, max_speed=config.max_speed)
+        elif renderer == "canvas":
+            self.renderer = CanvasRenderer(config, figsize=resolution / 100, dpi=100)
+        else:
+            raise ValueError(f"未知的渲染方式: {renderer}")
+
+    def run(self, steps: int, render_every: int = 1) -> dict:
+        """
+        推进模拟并按间隔渲染
+        Args:
+            steps: 模拟步数
+            render_every: 渲染间隔（步），须不小于1
+        Returns:
+            stats: 步速率、本次渲染帧数与累计丢帧数
+        """
+        if render_every < 1:
+            raise ValueError(f"render_every 必须不小于1: {render_every}")
+        start = time.perf_counter()
+        frames = 0
+        for step in range(steps):
+            self.system.update()
+            if self.writer is not None and step % render_every == 0:
+                speeds = np.linalg.norm(self.system.velocities, axis=1)
+                # 渲染结果复用缓冲，提交前复制以免写入线程读到后续帧
+                frame = self.renderer.render(self.system.positions, speeds)
+                self.writer.submit(self.frames, frame.copy())
+                self.frames += 1
+                frames += 1
+
+        elapsed = time.perf_counter() - start
+        stats = {
+            "steps": steps,
+            "steps_per_second": steps / elapsed if elapsed > 0 else float("inf"),
+            "frames": frames,
+            "dropped_frames": self.writer.dropped_frames if self.writer is not None else 0,
+        }
+        logger.info(f"无界面模拟完成: {stats['steps_per_second']:.1f} 步/秒, "
+                    f"渲染 {frames} 帧, 丢弃 {stats['dropped_frames']} 帧")
+        return stats
+
+    def close(self) -> None:
+        """等待写入线程清空队列并关闭输出端，之后不能再提交帧"""
+        if self.writer is not None:
+            self.writer.close()
+
+    def __enter__(self) -> "HeadlessSimulation":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    config = BoidsConfig(num_boids=2000, screen_size=60.0)
+    writer = AsyncFrameWriter(ImageSequenceSink(FIGURES_DIR / "headless", max_files=50))
+    with HeadlessSimulation(config, renderer="splat", writer=writer) as sim:
+        sim.run(steps=200, render_every=5)
@@ -0,0 +1,152 @@
+"""
+粒子初始布局模块
+向量化的低差异序列（Halton / Sobol）与随机布局，支持分块生成以应对超大规模粒子数
+"""
+
+from typing import Iterator, Optional, Tuple
+import numpy as np
+
+# 支持的初始布局
+LAYOUTS = ("halton", "sobol", "random")
+
+# Sobol序列位数（方向数以32位整数表示）
+_SOBOL_BITS = 32
+
+
+def radical_inverse(indices: np.ndarray, base: int) -> np.ndarray:
+    """
+    以整数数组逐位翻转计算基 base 的根式反演（van der Corput序列）
+    Args:
+        indices: 非负整数序号 (M,)
+        base: 进制基数
+    Returns:
+        values: [0,1) 区间内的浮点值 (M,)
+    """
+    i = np.asarray(indices, dtype=np.int64).copy()
+    result = np.zeros(i.shape, dtype=np.float64)
+    if i.size == 0:
+        return result
+    # 循环次数等于最大序号的位数，与逐元素标量算法逐位一致
+    num_digits = 0
+    remaining = int(i.max())
+    while remaining > 0:
+        remaining //= base
+        num_digits += 1
+
+    f = 1.0
+    for _ in range(num_digits):
+        f /= base
+        i, digit = np.divmod(i, base)
+        result += f * digit
+    return result
+
+
+def halton_sequence(n: int, start: int = 1) -> np.ndarray:
+    """
+    生成二维Halton序列（基2、基3）
+    Args:
+        n: 点数
+        start: 起始序号（分块生成时为块首序号）
+    Returns:
+        points: [0,1)² 内的点 (n,2)
+    """
+    indices = np.arange(start, start + n, dtype=np.int64)
+    return np.stack([radical_inverse(indices, 2), radical_inverse(indices, 3)], axis=1)
+
+
+def _sobol_directions() -> np.ndarray:
+    """二维Sobol方向数 (2,32)：第一维为位翻转，第二维对应本原多项式 x+1"""
+    directions = np.zeros((2, _SOBOL_BITS), dtype=np.uint64)
+    m = 1
+    for k in range(_SOBOL_BITS):
+        directions[0, k] = 1 << (_SOBOL_BITS - 1 - k)
+        directions[1, k] = m << (_SOBOL_BITS - 1 - k)
+        m = (m << 1) ^ m
+    return directions
+
+
+_SOBOL_DIRECTIONS = _sobol_directions()
+
+
+def sobol_sequence(n: int, start: int = 1) -> np.ndarray:
+    """
+    生成二维Sobol序列（逐位异或方向数，全向量化）
+    Args:
+        n: 点数
+        start: 起始序号（分块生成时为块首序号）
+    Returns:
+        points: [0,1)² 内的点 (n,2)
+    """
+    indices = np.arange(start, start + n, dtype=np.uint64)
+    bits = np.zeros((n, 2), dtype=np.uint64)
+    for k in range(_SOBOL_BITS):
+        bit = (indices >> np.uint64(k)) & np.uint64(1)
+        bits ^= bit[:, np.newaxis] * _SOBOL_DIRECTIONS[:, k]
+    return bits / float(1 << _SOBOL_BITS)
+
+
+def iter_layout_chunks(n: int, layout: str = "halton", rng: Optional[np.random.Generator] = None,
+                       chunk_size: int = 1 << 20) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    分块生成单位正方形内的初始布局
+    Args:
+        n: 总点数
+        layout: "halton"、"sobol" 或 "random"
+        rng: 随机布局使用的随机数生成器
+        chunk_size: 每块点数
+    Yields:
+        (offset, points): 块首偏移与该块的点 (m,2)
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"未知的初始布局: {layout}")
+    if layout == "random" and rng is None:
+        rng = np.random.default_rng()
+    for offset in range(0, n, chunk_size):
+        m = min(chunk_size, n - offset)
+        if layout == "halton":
+            yield offset, halton_sequence(m, start=offset + 1)
+        elif layout == "sobol":
+            yield offset, sobol_sequence(m, start=offset + 1)
+        else:
+            yield offset, rng.random((m, 2))
+
+
+def initial_positions(n: int, screen_size: float, layout: str = "halton",
+                      rng: Optional[np.random.Generator] = None, dtype: np.dtype = np.float64,
+                      chunk_size: int = 1 << 20, shift: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    生成缩放至模拟区域的初始位置，逐块写入预分配数组以限制峰值内存
+    Args:
+        n: 粒子数量
+        screen_size: 模拟区域尺寸
+        layout: 初始布局
+        rng: 随机布局使用的随机数生成器
+        dtype: 输出精度
+        chunk_size: 每块点数
+        shift: 可选的单位正方形内平移 (2,)，取模回绕（Cranley-Patterson 旋转，保持低差异性）
+    Returns:
+        positions: 初始位置 (n,2)
+    """
+    positions = np.empty((n, 2), dtype=dtype)
+    for offset, points in iter_layout_chunks(n, layout, rng, chunk_size):
+        if shift is not None:
+            points = np.remainder(points + shift, 1.0)
+        np.multiply(points, screen_size, out=positions[offset:offset + len(points)], casting="same_kind")
+    return positions
+
+
+def initial_velocities(n: int, rng: np.random.Generator, scale: float = 0.1,
+                       dtype: np.dtype = np.float64) -> np.ndarray:
+    """
+    生成正态分布初始速度（始终以float64抽样再转换，同一种子下各精度的初值一致）
+    Args:
+        n: 粒子数量
+        rng: 随机数生成器
+        scale: 标准差
+        dtype: 输出精度
+    Returns:
+        velocities: 初始速度 (n,2)
+    """
+    velocities = rng.standard_normal((n, 2))
+    velocities *= scale
+    return velocities.astype(dtype, copy=False)
@@ -0,0 +1,74 @@
+"""
+运行指标环形缓冲模块
+以固定容量的NumPy数组记录逐步标量指标，写入为O(1)且无内存分配，供日志聚合与实时看板读取
+"""
+
+from typing import Dict, Optional, Sequence
+import warnings
+import numpy as np
+
+# BoidsSystem 默认记录的指标字段
+STEP_FIELDS = ("step", "step_time", "mean_speed", "polarization", "mean_neighbors")
+
+
+class MetricsRingBuffer:
+    """定长环形缓冲，满后覆盖最旧记录"""
+
+    def __init__(self, capacity: int, fields: Sequence[str] = STEP_FIELDS):
+        """
+        Args:
+            capacity: 最多保留的记录条数
+            fields: 指标字段名（每条记录为等长浮点向量）
+        """
+        if capacity < 1:
+            raise ValueError(f"缓冲容量必须为正整数: {capacity}")
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self._index = {name: k for k, name in enumerate(self.fields)}
+        self._data = np.full((capacity, len(self.fields)), np.nan)
+        self._head = 0      # 下一条写入位置
+        self.total = 0      # 累计写入条数
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def record(self, *values: float) -> None:
+        """按字段顺序写入一条记录"""
+        self._data[self._head] = values
+        self._head = (self._head + 1) % self.capacity
+        self.total += 1
+
+    def _ordered(self, last: int) -> np.ndarray:
+        """按时间顺序返回最近 last 条记录（拷贝）"""
+        count = min(last, len(self))
+        idx = (self._head - count + np.arange(count)) % self.capacity
+        return self._data[idx]
+
+    def snapshot(self, last: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        获取按时间排序的历史数据（供实时看板读取）
+        Args:
+            last: 仅返回最近 last 条，默认返回全部
+        Returns:
+            history: 字段名到一维数组的映射
+        """
+        rows = self._ordered(len(self) if last is None else last)
+        return {name: rows[:, k] for name, k in self._index.items()}
+
+    def latest(self) -> Dict[str, float]:
+        """最近一条记录"""
+        if not len(self):
+            return {}
+        row = self._data[(self._head - 1) % self.capacity]
+        return {name: float(row[k]) for name, k in self._index.items()}
+
+    def aggregate(self, last: Optional[int] = None) -> Dict[str, float]:
+        """最近 last 条记录的逐字段均值（忽略NaN）"""
+        rows = self._ordered(len(self) if last is None else last)
+        if not len(rows):
+            return {}
+        with warnings.catch_warnings():
+            # 全为NaN的字段（如未采集的邻居数）返回NaN而不告警
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            means = np.nanmean(rows, axis=0)
+        return {name: float(means[k]) for name, k in self._index.items()}
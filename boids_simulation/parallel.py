@@ -0,0 +1,319 @@
+"""
+多进程区域分解模块
+将周期性区域沿x轴划分为条带，各工作进程通过共享内存零拷贝读写粒子状态，
+主进程每步一次性按条带分桶（本条带粒子与光晕粒子下标），工作进程只读取自己的桶，
+全局均值通过部分和归约得到
+"""
+
+from typing import Dict, List, Optional, Tuple
+import os
+import time
+import traceback
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+from boids import BoidsConfig, BoidsSystem
+from spatial import CellList, dense_pairs, minimum_image
+
+# 共享缓冲区名称
+_SHARED_BUFFERS = ("positions", "velocities", "forces")
+# 分桶下标缓冲区: 按条带连续存放的本条带/光晕粒子下标，以及各条带的起止偏移
+_INDEX_BUFFERS = ("own_index", "halo_index", "offsets")
+
+
+def _index_shapes(num_boids: int, num_strips: int) -> Dict[str, Tuple[int, ...]]:
+    """分桶缓冲区形状（每个粒子至多是两个相邻条带的光晕）"""
+    return {"own_index": (num_boids,), "halo_index": (2 * num_boids,),
+            "offsets": (2, num_strips + 1)}
+
+
+def _attach_buffers(names: Dict[str, str], shape: Tuple[int, int], dtype: str,
+                    num_strips: int) -> Tuple[List[shared_memory.SharedMemory], Dict[str, np.ndarray]]:
+    """附加到已存在的共享内存并构建数组视图"""
+    handles, arrays = [], {}
+    shapes = dict.fromkeys(_SHARED_BUFFERS, shape)
+    shapes.update(_index_shapes(shape[0], num_strips))
+    for key, buffer_shape in shapes.items():
+        shm = shared_memory.SharedMemory(name=names[key])
+        handles.append(shm)
+        buffer_dtype = dtype if key in _SHARED_BUFFERS else np.intp
+        arrays[key] = np.ndarray(buffer_shape, dtype=buffer_dtype, buffer=shm.buf)
+    return handles, arrays
+
+
+def bin_strips(x: np.ndarray, screen_size: float, separation_dist: float,
+               num_strips: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    将粒子按条带分桶（O(N)，每步只执行一次）
+    Args:
+        x: 粒子x坐标 (N,)
+        screen_size: 周期区域边长
+        separation_dist: 光晕宽度
+        num_strips: 条带数
+    Returns:
+        (own_index, halo_index, offsets): 两个下标数组均按条带连续、条带内按全局下标升序；
+        offsets[0]/offsets[1] 分别为本条带/光晕下标的各条带起止位置 (num_strips + 1,)
+    """
+    width = screen_size / num_strips
+    # 条带归属（浮点舍入落在边界上的粒子归入最后一个条带）
+    strip_ids = np.minimum((x / width).astype(np.intp), num_strips - 1)
+    own_index = np.argsort(strip_ids, kind="stable")
+    own_offsets = np.concatenate(([0], np.cumsum(np.bincount(strip_ids, minlength=num_strips))))
+
+    # 光晕: 周期意义下距相邻条带左右边界不超过分离距离的粒子（条带宽度不小于分离距离，
+    # 因此只需检查左右两个相邻条带；两个条带时左右相邻为同一条带，只计一次）
+    targets, members = [], []
+    neighbors = [] if num_strips == 1 else [-1] if num_strips == 2 else [-1, 1]
+    for shift in neighbors:
+        target = (strip_ids + shift) % num_strips
+        lo, hi = target * width, (target + 1) * width
+        near_edge = (((lo - x) % screen_size) < separation_dist) | \
+                    (((x - hi) % screen_size) < separation_dist)
+        members.append(np.flatnonzero(near_edge))
+        targets.append(target[members[-1]])
+    if targets:
+        halo_targets, halo_index = np.concatenate(targets), np.concatenate(members)
+        order = np.lexsort((halo_index, halo_targets))
+        halo_index = halo_index[order]
+        halo_counts = np.bincount(halo_targets, minlength=num_strips)
+    else:
+        halo_index = np.empty(0, dtype=np.intp)
+        halo_counts = np.zeros(num_strips, dtype=np.intp)
+    halo_offsets = np.concatenate(([0], np.cumsum(halo_counts)))
+    return own_index, halo_index, np.stack((own_offsets, halo_offsets))
+
+
+class _StripWorker:
+    """单个条带的计算逻辑（运行于工作进程内）"""
+
+    def __init__(self, cfg: BoidsConfig, arrays: Dict[str, np.ndarray],
+                 strip: int, num_strips: int):
+        self.cfg = cfg
+        self.arrays = arrays
+        self.strip = strip
+        self.num_strips = num_strips
+        self.cell_list = (CellList(cfg.screen_size, cfg.separation_dist)
+                          if CellList.supports(cfg.screen_size, cfg.separation_dist) else None)
+        self.own = np.empty(0, dtype=np.intp)
+
+    def compute_forces(self) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        计算本条带粒子的分离力并返回位置/速度部分和
+        Returns:
+            (position_sum, velocity_sum, count): 用于全局均值归约
+        """
+        cfg = self.cfg
+        positions, velocities = self.arrays["positions"], self.arrays["velocities"]
+
+        # 读取主进程分好的本条带与光晕下标（仅 O(N/P)）
+        offsets = self.arrays["offsets"]
+        self.own = self.arrays["own_index"][offsets[0, self.strip]:offsets[0, self.strip + 1]].copy()
+        halo = self.arrays["halo_index"][offsets[1, self.strip]:offsets[1, self.strip + 1]]
+
+        local = np.concatenate((self.own, halo))
+        local_pos = positions[local]
+        if self.cell_list is not None:
+            i, j = self.cell_list.query_pairs(local_pos)
+        else:
+            i, j = dense_pairs(local_pos, cfg.screen_size, cfg.separation_dist)
+
+        # 仅累加本条带粒子（局部下标前 n_own 个）的分离向量
+        n_own = len(self.own)
+        keep = i < n_own
+        i, j = i[keep], j[keep]
+        delta_pos = minimum_image(local_pos[i] - local_pos[j], cfg.screen_size)
+        neighbor_counts = np.maximum(np.bincount(i, minlength=n_own), 1)
+        forces = self.arrays["forces"]
+        forces[self.own, 0] = np.bincount(i, weights=delta_pos[:, 0], minlength=n_own) / neighbor_counts
+        forces[self.own, 1] = np.bincount(i, weights=delta_pos[:, 1], minlength=n_own) / neighbor_counts
+        forces[self.own] *= cfg.separation_factor
+
+        return (positions[self.own].sum(axis=0, dtype=np.float64),
+                velocities[self.own].sum(axis=0, dtype=np.float64), n_own)
+
+    def integrate(self, avg_velocity: np.ndarray, center: np.ndarray) -> None:
+        """
+        使用全局均值更新本条带粒子的速度与位置
+        Args:
+            avg_velocity: 全局平均速度 (2,)
+            center: 全局质心 (2,)
+        """
+        cfg = self.cfg
+        own = self.own
+        positions, velocities = self.arrays["positions"], self.arrays["velocities"]
+        pos, vel = positions[own], velocities[own]
+
+        force = self.arrays["forces"][own]
+        force += (avg_velocity - vel) * cfg.alignment_factor
+        force += (center - pos) * cfg.cohesion_factor
+        vel += force * cfg.dt
+
+        speed = np.sqrt(np.einsum('ij,ij->i', vel, vel))
+        vel *= (cfg.max_speed / np.maximum(speed, cfg.max_speed))[:, np.newaxis]
+        pos += vel * cfg.dt
+        np.remainder(pos, cfg.screen_size, out=pos)
+
+        velocities[own] = vel
+        positions[own] = pos
+
+
+def _worker_main(conn, cfg: BoidsConfig, names: Dict[str, str], shape: Tuple[int, int],
+                 dtype: str, strip: int, num_strips: int) -> None:
+    """工作进程主循环: 按主进程指令执行各计算阶段"""
+    handles, arrays = _attach_buffers(names, shape, dtype, num_strips)
+    worker = _StripWorker(cfg, arrays, strip, num_strips)
+    try:
+        while True:
+            command, payload = conn.recv()
+            if command == "stop":
+                break
+            try:
+                if command == "forces":
+                    conn.send(("ok", worker.compute_forces()))
+                elif command == "integrate":
+                    worker.integrate(*payload)
+                    conn.send(("ok", None))
+                else:
+                    conn.send(("error", f"未知指令: {command}"))
+            except Exception:
+                conn.send(("error", traceback.format_exc()))
+    finally:
+        del worker, arrays
+        for shm in handles:
+            shm.close()
+        conn.close()
+
+
+class ParallelBoidsSystem(BoidsSystem):
+    """基于共享内存与条带区域分解的多进程群体模拟引擎"""
+
+    def __init__(self, config: BoidsConfig, num_workers: Optional[int] = None):
+        """
+        初始化并行系统，粒子状态迁移至共享内存
+        Args:
+            config: 系统配置参数（并行模式下始终使用网格搜索，忽略 verlet_skin）
+            num_workers: 工作进程数，默认为CPU核数；条带宽度不小于分离距离
+        """
+        super().__init__(config)
+        max_strips = max(1, int(config.screen_size // config.separation_dist))
+        self.num_workers = max(1, min(num_workers or os.cpu_count() or 1, max_strips))
+
+        # 将粒子状态迁移至共享内存，主进程与工作进程共享同一份数据
+        shape = (config.num_boids, 2)
+        self._shm: Dict[str, shared_memory.SharedMemory] = {}
+        sources = {"positions": self.positions, "velocities": self.velocities,
+                   "forces": np.zeros(shape, dtype=self.dtype)}
+        for key in _SHARED_BUFFERS:
+            shm = shared_memory.SharedMemory(create=True, size=max(1, sources[key].nbytes))
+            self._shm[key] = shm
+            view = np.ndarray(shape, dtype=self.dtype, buffer=shm.buf)
+            view[...] = sources[key]
+            setattr(self, key, view)
+        self._index_arrays: Dict[str, np.ndarray] = {}
+        for key, index_shape in _index_shapes(config.num_boids, self.num_workers).items():
+            size = int(np.prod(index_shape)) * np.dtype(np.intp).itemsize
+            shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+            self._shm[key] = shm
+            self._index_arrays[key] = np.ndarray(index_shape, dtype=np.intp, buffer=shm.buf)
+
+        names = {key: shm.name for key, shm in self._shm.items()}
+        self._connections = []
+        self._workers = []
+        for strip in range(self.num_workers):
+            parent_conn, child_conn = mp.Pipe()
+            proc = mp.Process(
+                target=_worker_main,
+                args=(child_conn, config, names, shape, self.dtype.str, strip, self.num_workers),
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._workers.append(proc)
+        self.logger.info(f"并行模式已启动: {self.num_workers} 个条带工作进程")
+
+    def _broadcast(self, command: str, payload=None) -> list:
+        """向全部工作进程发送指令并等待完成（作为每阶段的同步屏障）"""
+        for conn in self._connections:
+            conn.send((command, payload))
+        results = []
+        for conn in self._connections:
+            status, result = conn.recv()
+            if status != "ok":
+                raise RuntimeError(f"工作进程执行失败:\n{result}")
+            results.append(result)
+        return results
+
+    def update(self) -> None:
+        """执行一次并行状态更新"""
+        try:
+            start = time.perf_counter()
+            # 按条带分桶写入共享下标缓冲区
+            own_index, halo_index, offsets = bin_strips(
+                self.positions[:, 0], self.cfg.screen_size,
+                self.cfg.separation_dist, self.num_workers)
+            self._index_arrays["own_index"][:len(own_index)] = own_index
+            self._index_arrays["halo_index"][:len(halo_index)] = halo_index
+            self._index_arrays["offsets"][...] = offsets
+
+            # 阶段一: 各条带计算分离力并返回部分和
+            partials = self._broadcast("forces")
+            count = max(sum(p[2] for p in partials), 1)
+            center = sum(p[0] for p in partials) / count
+            avg_velocity = sum(p[1] for p in partials) / count
+
+            # 阶段二: 广播全局均值，各条带独立积分
+            self._broadcast("integrate", (avg_velocity.astype(self.dtype), center.astype(self.dtype)))
+
+            self._after_step(time.perf_counter() - start)
+
+        except Exception as e:
+            self.logger.error(f"Update failed: {str(e)}")
+            raise RuntimeError("System update error") from e
+
+    def close(self) -> None:
+        """停止工作进程并释放共享内存"""
+        for conn in self._connections:
+            try:
+                conn.send(("stop", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._workers:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        self._connections, self._workers = [], []
+
+        # 释放前将状态复制回进程私有内存，保证关闭后仍可读取
+        self.positions = np.array(self.positions)
+        self.velocities = np.array(self.velocities)
+        self._index_arrays = {}
+        for shm in self._shm.values():
+            shm.close()
+            shm.unlink()
+        self._shm = {}
+
+    def __enter__(self) -> "ParallelBoidsSystem":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+# 验证代码正确性
+if __name__ == "__main__":
+    config = BoidsConfig(num_boids=2000, screen_size=60.0)
+
+    with ParallelBoidsSystem(config, num_workers=4) as system:
+        reference = BoidsSystem(config)
+        reference.positions = system.positions.copy()
+        reference.velocities = system.velocities.copy()
+
+        for _ in range(10):
+            system.update()
+            reference.update()
+
+        error = np.abs(system.positions - reference.positions).max()
+        assert error < 1e-9, f"并行结果与串行结果不一致: {error}"
+        print(f"并行验证通过 - 最大位置误差: {error:.2e}")
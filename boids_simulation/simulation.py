@@ -3,7 +3,7 @@
 集成高性能渲染、状态监控和异常处理机制
 """
 
-from typing import Any
+from typing import Any, Optional
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 from pathlib import Path
@@ -13,18 +13,35 @@ import numpy as np
 # 类型注解
 from config import BoidsConfig, FIGURES_DIR, LOGS_DIR
 from boids import BoidsSystem
+from trajectory import TrajectoryRecorder
 
 class BoidsVisualizer:
     """群体行为可视化引擎"""
     
-    def __init__(self, config: BoidsConfig):
+    def __init__(self, config: BoidsConfig, recorder: Optional[TrajectoryRecorder] = None,
+                 checkpoint_path: Optional[Path] = None, checkpoint_every: int = 0,
+                 resume: bool = False):
         """
         初始化可视化系统
         Args:
             config: 群体行为配置参数
+            recorder: 可选的轨迹记录器，每步调用以保存位置与速度
+            checkpoint_path: 检查点文件路径
+            checkpoint_every: 后台检查点间隔（步），0表示不保存
+            resume: 若检查点存在则从中恢复（配置以检查点为准）
         """
-        self.cfg = config
-        self.system = BoidsSystem(config)
+        if resume and checkpoint_path is not None and Path(checkpoint_path).exists():
+            self.system = BoidsSystem.from_checkpoint(checkpoint_path)
+            logger.info(f"已从检查点恢复: 第 {self.system.step_count} 步")
+        else:
+            self.system = BoidsSystem(config)
+        self.cfg = self.system.cfg
+        if checkpoint_path is not None and checkpoint_every > 0:
+            self.system.enable_checkpointing(checkpoint_path, checkpoint_every)
+        self.recorder = recorder
+        if self.recorder is not None:
+            # 记录起始状态（帧以 system.step_count 标注，恢复运行时与中断前连续）
+            self.recorder.record(self.system)
         self._init_visualization()
         self._frame_counter = 0
         logger.info("可视化系统初始化完成")
@@ -86,6 +103,8 @@ class BoidsVisualizer:
         """
         try:
             self.system.update()
+            if self.recorder is not None:
+                self.recorder.record(self.system)
             self.scatter.set_offsets(self.system.positions)
             
             # 动态颜色映射反映速度变化
@@ -137,6 +156,10 @@ class BoidsVisualizer:
             logger.critical(f"致命错误: {str(e)}")
             raise
         finally:
+            self.system.wait_for_checkpoint()
+            if self.recorder is not None:
+                self.recorder.close()
+                logger.info(f"轨迹已保存至 {self.recorder.directory}")
             logger.success("模拟过程正常终止")
 
 if __name__ == "__main__":
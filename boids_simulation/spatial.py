@@ -0,0 +1,206 @@
+"""
+空间邻域检索模块
+基于均匀网格（Cell List）的周期性邻居搜索，复杂度随粒子数线性增长
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+
+# 类型别名定义
+PairArray = Tuple[np.ndarray, np.ndarray]  # (i, j) 索引对, 各自形状: (M,)
+
+# 3x3 邻域单元偏移
+_CELL_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def minimum_image(delta: np.ndarray, box_size: float) -> np.ndarray:
+    """
+    将位移向量映射到周期盒内的最近镜像（原地修改）
+    Args:
+        delta: 位移向量 (..., 2)
+        box_size: 周期盒边长
+    Returns:
+        delta: 最近镜像位移
+    """
+    delta -= box_size * np.round(delta / box_size)
+    return delta
+
+
+class CellList:
+    """周期性均匀网格邻居搜索引擎"""
+
+    def __init__(self, box_size: float, cutoff: float):
+        """
+        初始化网格划分
+        Args:
+            box_size: 周期盒边长
+            cutoff: 邻居截断半径（网格单元边长不小于该值）
+        """
+        if not self.supports(box_size, cutoff):
+            raise ValueError(f"截断半径 {cutoff} 过大, 周期盒 {box_size} 无法划分至少3x3网格")
+        self.box_size = float(box_size)
+        self.cutoff = float(cutoff)
+        self.n_cells = int(box_size // cutoff)
+        self.cell_size = self.box_size / self.n_cells
+
+    @staticmethod
+    def supports(box_size: float, cutoff: float) -> bool:
+        """判断能否构建不重复计数的3x3邻域网格"""
+        return cutoff > 0 and int(box_size // cutoff) >= 3
+
+    def _cell_coords(self, positions: np.ndarray) -> np.ndarray:
+        """计算粒子所在网格坐标 (N,2)"""
+        coords = np.floor(positions / self.cell_size).astype(np.intp)
+        # 浮点舍入可能落在 n_cells 上, 统一折回周期范围
+        coords %= self.n_cells
+        return coords
+
+    def query_pairs(self, positions: np.ndarray, groups: Optional[np.ndarray] = None) -> PairArray:
+        """
+        检索所有距离小于截断半径的有序粒子对（不含自身）
+        Args:
+            positions: 粒子位置 (N,2)，需已位于 [0, box_size) 内
+            groups: 可选的分组编号 (N,)，不同组的粒子互不为邻（用于批量独立系统）
+        Returns:
+            (i, j): 邻居索引对，每个无序对出现两次
+        """
+        n = self.n_cells
+        coords = self._cell_coords(positions)
+        # 分组编号作为网格编号的最高位，使各组落在互不相交的网格区间
+        group_base = 0 if groups is None else groups * (n * n)
+        num_groups = 1 if groups is None or len(groups) == 0 else int(groups.max()) + 1
+        cell_ids = group_base + coords[:, 0] * n + coords[:, 1]
+
+        # 按网格编号排序，得到每个单元在排序数组中的起止偏移
+        order = np.argsort(cell_ids, kind='stable')
+        counts = np.bincount(cell_ids, minlength=num_groups * n * n)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+        # 以排序后的顺序遍历粒子以改善访存局部性
+        sorted_coords = coords[order]
+        sorted_base = group_base if groups is None else group_base[order]
+        cutoff_sq = self.cutoff ** 2
+        pairs_i, pairs_j = [], []
+        for dx, dy in _CELL_OFFSETS:
+            nbr_cells = (sorted_base + ((sorted_coords[:, 0] + dx) % n) * n
+                         + (sorted_coords[:, 1] + dy) % n)
+            cand_counts = counts[nbr_cells]
+            total = int(cand_counts.sum())
+            if total == 0:
+                continue
+
+            # 展开候选对: 每个粒子 i 对应其邻域单元内的全部粒子 j
+            i = np.repeat(order, cand_counts)
+            local = np.arange(total) - np.repeat(np.cumsum(cand_counts) - cand_counts, cand_counts)
+            j = order[np.repeat(starts[nbr_cells], cand_counts) + local]
+
+            delta = minimum_image(positions[i] - positions[j], self.box_size)
+            keep = (np.einsum('ij,ij->i', delta, delta) < cutoff_sq) & (i != j)
+            pairs_i.append(i[keep])
+            pairs_j.append(j[keep])
+
+        if not pairs_i:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty.copy()
+        return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+
+def dense_pairs(positions: np.ndarray, box_size: float, cutoff: float,
+                groups: Optional[np.ndarray] = None) -> PairArray:
+    """
+    稠密O(N²)邻居对检索，用于网格无法划分的小周期盒
+    Args:
+        positions: 粒子位置 (N,2)
+        box_size: 周期盒边长
+        cutoff: 邻居截断半径
+        groups: 可选的分组编号 (N,)，不同组的粒子互不为邻
+    Returns:
+        (i, j): 邻居索引对（不含自身）
+    """
+    delta = minimum_image(positions[:, np.newaxis] - positions, box_size)
+    mask = np.einsum('ijk,ijk->ij', delta, delta) < cutoff ** 2
+    np.fill_diagonal(mask, False)
+    if groups is not None:
+        mask &= groups[:, np.newaxis] == groups
+    return np.nonzero(mask)
+
+
+class VerletList:
+    """带表皮层的Verlet邻居表，仅在累计位移超过半个表皮层时重建"""
+
+    def __init__(self, box_size: float, cutoff: float, skin: float):
+        """
+        初始化邻居表
+        Args:
+            box_size: 周期盒边长
+            cutoff: 实际作用截断半径
+            skin: 表皮层厚度，邻居表半径为 cutoff + skin
+        """
+        if skin <= 0:
+            raise ValueError(f"表皮层厚度必须为正数: {skin}")
+        self.box_size = float(box_size)
+        self.cutoff = float(cutoff)
+        self.skin = float(skin)
+        self.list_radius = self.cutoff + self.skin
+        self.cell_list = (CellList(box_size, self.list_radius)
+                          if CellList.supports(box_size, self.list_radius) else None)
+
+        self.pairs: PairArray = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+        self._reference_positions = None
+        # 统计计数: 查询次数与重建次数
+        self.queries = 0
+        self.rebuilds = 0
+
+    def needs_rebuild(self, positions: np.ndarray) -> bool:
+        """判断自上次构建以来的最大位移是否超过半个表皮层"""
+        if self._reference_positions is None or len(positions) != len(self._reference_positions):
+            return True
+        displacement = minimum_image(positions - self._reference_positions, self.box_size)
+        max_disp_sq = np.einsum('ij,ij->i', displacement, displacement).max(initial=0.0)
+        return max_disp_sq > (0.5 * self.skin) ** 2
+
+    def rebuild(self, positions: np.ndarray, groups: Optional[np.ndarray] = None) -> None:
+        """以 cutoff + skin 半径重新检索邻居对"""
+        if self.cell_list is not None:
+            self.pairs = self.cell_list.query_pairs(positions, groups)
+        else:
+            self.pairs = dense_pairs(positions, self.box_size, self.list_radius, groups)
+        self._reference_positions = positions.copy()
+        self.rebuilds += 1
+
+    def query_pairs(self, positions: np.ndarray, groups: Optional[np.ndarray] = None) -> PairArray:
+        """
+        返回候选邻居对（必要时重建），调用方需按实际截断半径再筛选
+        Args:
+            positions: 粒子位置 (N,2)
+            groups: 可选的分组编号 (N,)，需在多次查询间保持不变
+        Returns:
+            (i, j): 距离小于 cutoff + skin 的候选邻居对
+        """
+        self.queries += 1
+        if self.needs_rebuild(positions):
+            self.rebuild(positions, groups)
+        return self.pairs
+
+    def state_dict(self) -> dict:
+        """导出邻居表状态（用于检查点）"""
+        state = {
+            "verlet_pairs": np.stack(self.pairs),
+            "verlet_counters": np.array([self.queries, self.rebuilds]),
+        }
+        if self._reference_positions is not None:
+            state["verlet_reference"] = self._reference_positions.copy()
+        return state
+
+    def load_state_dict(self, state: dict) -> None:
+        """从检查点恢复邻居表状态"""
+        pairs = state["verlet_pairs"].astype(np.intp)
+        self.pairs = (pairs[0], pairs[1])
+        self.queries, self.rebuilds = (int(c) for c in state["verlet_counters"])
+        reference = state.get("verlet_reference")
+        self._reference_positions = None if reference is None else reference.copy()
+
+    @property
+    def rebuild_ratio(self) -> float:
+        """重建次数占查询次数的比例"""
+        return self.rebuilds / self.queries if self.queries else 0.0
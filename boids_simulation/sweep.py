@@ -0,0 +1,195 @@
+"""
+参数扫描模块
+在进程池中并行运行无界面模拟，按配置哈希缓存结果，中断或重复扫描时自动跳过已完成的参数点
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, fields, replace
+from itertools import product
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+from loguru import logger
+
+from boids import BoidsConfig, BoidsSystem
+
+# 结果缓存默认目录
+CACHE_DIR = Path(__file__).parent / "sweeps"
+
+# 允许扫描的配置字段
+SWEEPABLE_FIELDS = {f.name for f in fields(BoidsConfig)}
+
+
+def grid_configs(base: BoidsConfig, **param_values: Sequence) -> List[BoidsConfig]:
+    """
+    生成参数网格（笛卡尔积）
+    Args:
+        base: 基础配置
+        param_values: 字段名到候选值列表的映射，如 alignment_factor=[0.05, 0.1]
+    Returns:
+        configs: 网格上全部配置
+    """
+    _check_fields(param_values)
+    names = list(param_values)
+    return [replace(base, **dict(zip(names, values)))
+            for values in product(*(param_values[name] for name in names))]
+
+
+def random_configs(base: BoidsConfig, num_samples: int, seed: Optional[int] = None,
+                   **param_ranges: Tuple[float, float]) -> List[BoidsConfig]:
+    """
+    在参数区间内均匀随机采样
+    Args:
+        base: 基础配置
+        num_samples: 采样数量
+        seed: 采样随机种子
+        param_ranges: 字段名到 (下界, 上界) 的映射
+    Returns:
+        configs: 采样得到的配置
+    """
+    _check_fields(param_ranges)
+    rng = np.random.default_rng(seed)
+    samples = {name: rng.uniform(lo, hi, num_samples) for name, (lo, hi) in param_ranges.items()}
+    return [replace(base, **{name: float(values[k]) for name, values in samples.items()})
+            for k in range(num_samples)]
+
+
+def _check_fields(params: Dict) -> None:
+    unknown = set(params) - SWEEPABLE_FIELDS
+    if unknown:
+        raise ValueError(f"未知的配置字段: {sorted(unknown)}")
+
+
+def config_hash(config: BoidsConfig, steps: int, measure_steps: int) -> str:
+    """由配置与运行参数计算稳定的缓存键"""
+    key = json.dumps({"config": asdict(config), "steps": steps, "measure_steps": measure_steps},
+                     sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def run_point(config: BoidsConfig, steps: int, measure_steps: int) -> Dict:
+    """
+    运行单个参数点并对末尾 measure_steps 步的序参量取平均
+    Args:
+        config: 模拟配置
+        steps: 总步数
+        measure_steps: 参与统计的末尾步数
+    Returns:
+        result: 配置与序参量均值
+    """
+    system = BoidsSystem(config)
+    samples = []
+    for step in range(steps):
+        system.update()
+        if step >= steps - measure_steps:
+            samples.append(system.order_parameters())
+    metrics = {key: float(np.mean([s[key] for s in samples])) for key in samples[0]} if samples else {}
+    return {"config": asdict(config), "steps": steps, "measure_steps": measure_steps, "metrics": metrics}
+
+
+class SweepRunner:
+    """带磁盘缓存的并行参数扫描器"""
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, num_workers: Optional[int] = None):
+        """
+        Args:
+            cache_dir: 结果缓存目录，每个参数点一个JSON文件
+            num_workers: 进程池大小，默认为CPU核数
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.num_workers = num_workers or os.cpu_count() or 1
+
+    def _cache_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _load_cached(self, key: str) -> Optional[Dict]:
+        path = self._cache_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"缓存文件损坏，将重新计算: {path} ({str(e)})")
+            return None
+
+    def _store(self, key: str, result: Dict) -> None:
+        """原子写入单个参数点结果"""
+        path = self._cache_path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def run(self, configs: Iterable[BoidsConfig], steps: int = 500,
+            measure_steps: int = 100) -> List[Dict]:
+        """
+        执行扫描
+        Args:
+            configs: 参数点配置
+            steps: 每个参数点的模拟步数
+            measure_steps: 统计序参量的末尾步数
+        Returns:
+            results: 与输入顺序一致的结果列表（含缓存命中）
+        """
+        configs = list(configs)
+        keys = [config_hash(cfg, steps, measure_steps) for cfg in configs]
+        results: Dict[str, Dict] = {}
+        pending = {}
+        for key, cfg in zip(keys, configs):
+            cached = self._load_cached(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending.setdefault(key, cfg)
+        logger.info(f"参数扫描: 共 {len(configs)} 点, 缓存命中 {len(results)}, 待计算 {len(pending)}")
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.num_workers) as pool:
+                futures = {pool.submit(run_point, cfg, steps, measure_steps): key
+                           for key, cfg in pending.items()}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    key = futures[future]
+                    result = future.result()
+                    result["key"] = key
+                    # 每完成一点立即落盘，中断后可从断点继续
+                    self._store(key, result)
+                    results[key] = result
+                    logger.info(f"[{done}/{len(pending)}] {key}: {result['metrics']}")
+
+        return [results[key] for key in keys]
+
+
+def _parse_values(text: str) -> List[float]:
+    """解析逗号分隔的参数取值"""
+    return [float(v) for v in text.split(",") if v]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Boids参数扫描")
+    parser.add_argument("--alignment", default="0.05,0.1,0.2", help="alignment_factor 取值")
+    parser.add_argument("--cohesion", default="0.005,0.01,0.02", help="cohesion_factor 取值")
+    parser.add_argument("--separation", default="0.05", help="separation_factor 取值")
+    parser.add_argument("--separation-dist", default="1.5", help="separation_dist 取值")
+    parser.add_argument("--num-boids", type=int, default=200)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--measure-steps", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    sweep_configs = grid_configs(
+        BoidsConfig(num_boids=args.num_boids, seed=0),
+        alignment_factor=_parse_values(args.alignment),
+        cohesion_factor=_parse_values(args.cohesion),
+        separation_factor=_parse_values(args.separation),
+        separation_dist=_parse_values(args.separation_dist),
+    )
+    for res in SweepRunner(num_workers=args.workers).run(sweep_configs, args.steps, args.measure_steps):
+        cfg = res["config"]
+        print(f"ali={cfg['alignment_factor']:<6} coh={cfg['cohesion_factor']:<6} "
+              f"sep={cfg['separation_factor']:<6} dist={cfg['separation_dist']:<5} -> {res['metrics']}")
@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+import pytest
+
+# 项目模块以扁平方式导入（from boids import BoidsSystem），测试时将项目目录加入搜索路径
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """BoidsSystem 将日志写入当前目录下的 logs/，测试时切换到临时目录"""
+    monkeypatch.chdir(tmp_path)
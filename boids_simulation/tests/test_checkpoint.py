@@ -0,0 +1,87 @@
+"""
+检查点测试
+从检查点恢复后继续演化，应与不中断运行的结果逐位一致
+"""
+
+import numpy as np
+import pytest
+from boids import BoidsConfig, BoidsSystem
+from ensemble import BoidsEnsemble
+from checkpoint import read_checkpoint, write_checkpoint
+
+def config(**overrides) -> BoidsConfig:
+    params = dict(num_boids=200, screen_size=20.0, seed=7, log_every=0)
+    params.update(overrides)
+    return BoidsConfig(**params)
+
+def assert_same_state(a, b):
+    np.testing.assert_array_equal(a.positions, b.positions)
+    np.testing.assert_array_equal(a.velocities, b.velocities)
+    assert a.step_count == b.step_count
+
+@pytest.mark.parametrize("overrides", [
+    {},
+    {"dtype": "float32"},
+    {"verlet_skin": 0.3},
+    {"init_layout": "random", "neighbor_search": "dense"},
+], ids=["default", "float32", "verlet", "random-dense"])
+def test_resume_is_bit_identical(tmp_path, overrides):
+    uninterrupted = BoidsSystem(config(**overrides))
+    interrupted = BoidsSystem(config(**overrides))
+    for _ in range(15):
+        uninterrupted.update()
+        interrupted.update()
+    path = tmp_path / "state.npz"
+    interrupted.save_checkpoint(path)
+
+    resumed = BoidsSystem.from_checkpoint(path)
+    assert resumed.cfg == interrupted.cfg
+    for _ in range(25):
+        uninterrupted.update()
+        resumed.update()
+    assert_same_state(resumed, uninterrupted)
+    # 随机数流同样接续
+    assert resumed.rng.random() == uninterrupted.rng.random()
+
+def test_background_checkpoint(tmp_path):
+    system = BoidsSystem(config())
+    path = tmp_path / "periodic.npz"
+    system.enable_checkpointing(path, every=5)
+    for _ in range(12):
+        system.update()
+    system.wait_for_checkpoint()
+    assert int(read_checkpoint(path)["step_count"]) == 10
+
+def test_checkpoint_round_trip_fields(tmp_path):
+    state = {"positions": np.arange(6.0).reshape(3, 2), "step_count": 3,
+             "config": {"num_boids": 3}, "extra": {"note": "x"}}
+    loaded = read_checkpoint(write_checkpoint(tmp_path / "raw.npz", state))
+    np.testing.assert_array_equal(loaded["positions"], state["positions"])
+    assert loaded["config"] == state["config"] and loaded["extra"] == state["extra"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_shape_mismatch_rejected(tmp_path):
+    path = tmp_path / "state.npz"
+    BoidsSystem(config()).save_checkpoint(path)
+    with pytest.raises(ValueError):
+        BoidsSystem(config(num_boids=100)).load_state_dict(read_checkpoint(path))
+
+def test_ensemble_resume_is_bit_identical(tmp_path):
+    uninterrupted = BoidsEnsemble(config(num_boids=100), 3, seeds=[1, 2, 3])
+    interrupted = BoidsEnsemble(config(num_boids=100), 3, seeds=[1, 2, 3])
+    for _ in range(10):
+        uninterrupted.update()
+        interrupted.update()
+    path = tmp_path / "ensemble.npz"
+    interrupted.save_checkpoint(path)
+    resumed = BoidsEnsemble.from_checkpoint(path)
+    for _ in range(10):
+        uninterrupted.update()
+        resumed.update()
+    assert_same_state(resumed, uninterrupted)
+
+def test_ensemble_replicas_start_apart():
+    ensemble = BoidsEnsemble(config(num_boids=100), 3, seeds=[1, 2, 3])
+    assert not np.array_equal(ensemble.positions[0], ensemble.positions[1])
+    single = BoidsSystem(config(num_boids=100, seed=2))
+    np.testing.assert_array_equal(ensemble.velocities[1], single.velocities)
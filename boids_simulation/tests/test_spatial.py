@@ -0,0 +1,67 @@
+"""
+邻居搜索测试
+网格（Cell List）与 Verlet 邻居表的检索结果应与稠密 O(N²) 检索一致
+"""
+
+import numpy as np
+import pytest
+from boids import BoidsConfig, BoidsSystem
+from spatial import CellList, VerletList, dense_pairs, minimum_image
+
+BOX, CUTOFF = 20.0, 1.5
+
+def pair_set(pairs) -> set:
+    i, j = pairs
+    return set(zip(i.tolist(), j.tolist()))
+
+def random_positions(n: int, seed: int) -> np.ndarray:
+    positions = np.random.default_rng(seed).random((n, 2)) * BOX
+    positions[:4] = [[0.0, 0.0], [BOX - 1e-9, 0.1], [0.2, BOX - 0.3], [BOX / 2, BOX - 1e-12]]  # 跨周期边界的粒子
+    return positions
+
+@pytest.mark.parametrize("seed", range(3))
+def test_cell_list_matches_dense(seed):
+    positions = random_positions(500, seed)
+    expected = pair_set(dense_pairs(positions, BOX, CUTOFF))
+    assert expected
+    assert pair_set(CellList(BOX, CUTOFF).query_pairs(positions)) == expected
+
+def test_cell_list_respects_groups():
+    positions = random_positions(400, 3)
+    groups = np.repeat(np.arange(4), 100)
+    expected = pair_set(dense_pairs(positions, BOX, CUTOFF, groups))
+    assert pair_set(CellList(BOX, CUTOFF).query_pairs(positions, groups)) == expected
+    assert all(groups[i] == groups[j] for i, j in expected)
+
+def test_cell_list_requires_three_cells():
+    assert not CellList.supports(4.0, 1.5)
+    with pytest.raises(ValueError):
+        CellList(4.0, 1.5)
+
+def within_cutoff(positions: np.ndarray, pairs) -> set:
+    i, j = pairs
+    delta = minimum_image(positions[i] - positions[j], BOX)
+    keep = np.einsum('ij,ij->i', delta, delta) < CUTOFF ** 2
+    return set(zip(i[keep].tolist(), j[keep].tolist()))
+
+def test_verlet_list_matches_dense_while_moving():
+    rng = np.random.default_rng(4)
+    positions = random_positions(300, 4)
+    verlet = VerletList(BOX, CUTOFF, skin=0.5)
+    for _ in range(40):
+        candidates = verlet.query_pairs(positions)
+        assert within_cutoff(positions, candidates) == pair_set(dense_pairs(positions, BOX, CUTOFF))
+        positions = np.remainder(positions + rng.normal(scale=0.05, size=positions.shape), BOX)
+    assert 1 < verlet.rebuilds < verlet.queries
+
+@pytest.mark.parametrize("search, skin", [("cell_list", 0.0), ("cell_list", 0.4)])
+def test_system_neighbor_search_matches_dense(search, skin):
+    base = dict(num_boids=300, screen_size=BOX, separation_dist=CUTOFF, seed=5, log_every=0)
+    reference = BoidsSystem(BoidsConfig(neighbor_search="dense", **base))
+    system = BoidsSystem(BoidsConfig(neighbor_search=search, verlet_skin=skin, **base))
+    for _ in range(30):
+        reference.update()
+        system.update()
+    # 邻居对顺序不同只影响浮点求和顺序
+    np.testing.assert_allclose(system.positions, reference.positions, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(system.velocities, reference.velocities, rtol=0, atol=1e-9)
@@ -0,0 +1,239 @@
+"""
+轨迹记录与回放模块
+以分块内存映射的 .npy 文件追加保存每步（或每k步）的位置与速度及其所在步数，
+读取端按需映射数据块，可随机定位任意步并惰性迭代，无需整体载入内存
+"""
+
+from typing import Iterator, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+import json
+import os
+import numpy as np
+
+# 存储格式版本与文件命名（版本1未保存步数，按 帧序号*every 推算）
+FORMAT_VERSION = 2
+HEADER_FILE = "header.json"
+CHUNK_PATTERN = "chunk_{:06d}.npy"
+STEPS_PATTERN = "steps_{:06d}.npy"
+
+# 单帧数据布局: frame[0] 为位置 (N,2), frame[1] 为速度 (N,2)
+Frame = Tuple[int, np.ndarray, np.ndarray]  # (步数, 位置, 速度)
+
+
+def _write_header(directory: Path, header: dict) -> None:
+    """原子写入头文件（先写临时文件再替换）"""
+    tmp_path = directory / (HEADER_FILE + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(header, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, directory / HEADER_FILE)
+
+
+class TrajectoryRecorder:
+    """分块内存映射轨迹记录器"""
+
+    def __init__(self, directory: Path, config, every: int = 1,
+                 chunk_frames: int = 256, dtype: Optional[str] = None):
+        """
+        创建轨迹存储目录
+        Args:
+            directory: 存储目录（不存在时自动创建）
+            config: 被记录系统的配置（写入头文件以便回放）
+            every: 记录间隔，系统步数 step_count 为 every 的倍数时保存一帧
+            chunk_frames: 每个数据块包含的帧数
+            dtype: 存储精度，默认沿用配置中的 dtype
+        """
+        if every < 1 or chunk_frames < 1:
+            raise ValueError("记录间隔与分块帧数必须为正整数")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.every = every
+        self.chunk_frames = chunk_frames
+        self.num_boids = config.num_boids
+        self.dtype = np.dtype(dtype or getattr(config, "dtype", "float64"))
+
+        self.header = {
+            "version": FORMAT_VERSION,
+            "num_boids": self.num_boids,
+            "dtype": self.dtype.str,
+            "every": every,
+            "chunk_frames": chunk_frames,
+            "num_frames": 0,
+            "config": asdict(config),
+        }
+        self._chunk = None
+        self._steps = None
+        self._chunk_index = -1
+        _write_header(self.directory, self.header)
+
+    @property
+    def num_frames(self) -> int:
+        """已记录帧数"""
+        return self.header["num_frames"]
+
+    def _open_chunk(self, index: int) -> None:
+        """创建并映射新的数据块"""
+        self._flush_chunk()
+        path = self.directory / CHUNK_PATTERN.format(index)
+        self._chunk = np.lib.format.open_memmap(
+            path, mode="w+", dtype=self.dtype,
+            shape=(self.chunk_frames, 2, self.num_boids, 2)
+        )
+        self._steps = np.lib.format.open_memmap(
+            self.directory / STEPS_PATTERN.format(index), mode="w+",
+            dtype=np.int64, shape=(self.chunk_frames,)
+        )
+        self._chunk_index = index
+
+    def _flush_chunk(self) -> None:
+        """将当前数据块落盘"""
+        if self._chunk is not None:
+            self._chunk.flush()
+            self._steps.flush()
+
+    def record(self, system) -> bool:
+        """
+        记录系统当前状态（按系统步数抽样，从检查点恢复后步数保持连续）
+        Args:
+            system: 提供 positions / velocities / step_count 属性的模拟系统
+        Returns:
+            recorded: 本步是否写入了新帧
+        """
+        step = int(system.step_count)
+        if step % self.every:
+            return False
+
+        frame = self.num_frames
+        chunk_index, offset = divmod(frame, self.chunk_frames)
+        if chunk_index != self._chunk_index:
+            self._open_chunk(chunk_index)
+            # 数据块写满时同步头文件，中断后已完成的数据块仍可回放
+            _write_header(self.directory, self.header)
+        self._chunk[offset, 0] = system.positions
+        self._chunk[offset, 1] = system.velocities
+        self._steps[offset] = step
+        self.header["num_frames"] = frame + 1
+        return True
+
+    def flush(self) -> None:
+        """落盘当前数据并更新头文件"""
+        self._flush_chunk()
+        _write_header(self.directory, self.header)
+
+    def close(self) -> None:
+        """关闭记录器"""
+        self.flush()
+        self._chunk = None
+        self._steps = None
+
+    def __enter__(self) -> "TrajectoryRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class TrajectoryReader:
+    """轨迹回放读取器，按需映射数据块"""
+
+    def __init__(self, directory: Path, max_open_chunks: int = 8):
+        """
+        打开轨迹存储
+        Args:
+            directory: 记录器写入的存储目录
+            max_open_chunks: 同时保持映射的数据块数量上限
+        """
+        self.directory = Path(directory)
+        with open(self.directory / HEADER_FILE, encoding="utf-8") as f:
+            self.header = json.load(f)
+        if self.header.get("version") not in (1, FORMAT_VERSION):
+            raise ValueError(f"不支持的轨迹格式版本: {self.header.get('version')}")
+        self.num_boids = self.header["num_boids"]
+        self.every = self.header["every"]
+        self.chunk_frames = self.header["chunk_frames"]
+        self.config = self.header["config"]
+        self.max_open_chunks = max_open_chunks
+        self._chunks: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._steps: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.header["num_frames"]
+
+    def _get_chunk(self, index: int) -> np.ndarray:
+        """获取数据块的只读内存映射（LRU缓存）"""
+        chunk = self._chunks.get(index)
+        if chunk is None:
+            chunk = np.load(self.directory / CHUNK_PATTERN.format(index), mmap_mode="r")
+            self._chunks[index] = chunk
+            if len(self._chunks) > self.max_open_chunks:
+                self._chunks.popitem(last=False)
+        else:
+            self._chunks.move_to_end(index)
+        return chunk
+
+    @property
+    def steps(self) -> np.ndarray:
+        """各帧对应的系统步数 (num_frames,)（只含步数，整体载入）"""
+        if self._steps is None:
+            n = len(self)
+            if self.header["version"] == 1:
+                self._steps = np.arange(n, dtype=np.int64) * self.every
+            else:
+                num_chunks = -(-n // self.chunk_frames)
+                parts = [np.load(self.directory / STEPS_PATTERN.format(k)) for k in range(num_chunks)]
+                self._steps = np.concatenate(parts)[:n] if parts else np.empty(0, dtype=np.int64)
+        return self._steps
+
+    def frame(self, index: int) -> Frame:
+        """
+        读取指定帧
+        Args:
+            index: 帧序号（支持负数索引）
+        Returns:
+            (step, positions, velocities): 位置与速度为只读内存映射视图
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"帧序号越界: {index}")
+        chunk_index, offset = divmod(index, self.chunk_frames)
+        data = self._get_chunk(chunk_index)[offset]
+        return int(self.steps[index]), data[0], data[1]
+
+    def at_step(self, step: int) -> Frame:
+        """定位到不晚于指定步数的最近记录帧（早于首帧时返回首帧）"""
+        return self.frame(max(int(np.searchsorted(self.steps, step, side="right")) - 1, 0))
+
+    def iter_frames(self, start: int = 0, stop: Optional[int] = None,
+                    stride: int = 1) -> Iterator[Frame]:
+        """惰性迭代帧区间"""
+        for index in range(*slice(start, stop, stride).indices(len(self))):
+            yield self.frame(index)
+
+    def __iter__(self) -> Iterator[Frame]:
+        return self.iter_frames()
+
+
+# 验证代码正确性
+if __name__ == "__main__":
+    import tempfile
+    from boids import BoidsConfig, BoidsSystem
+
+    config = BoidsConfig(num_boids=100)
+    system = BoidsSystem(config)
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshots = []
+        with TrajectoryRecorder(Path(tmp), config, every=2, chunk_frames=4) as recorder:
+            for _ in range(21):
+                if recorder.record(system):
+                    snapshots.append(system.positions.copy())
+                system.update()
+
+        reader = TrajectoryReader(Path(tmp))
+        assert len(reader) == len(snapshots) == 11, "帧数不一致"
+        for k, ((step, positions, _), expected) in enumerate(zip(reader, snapshots)):
+            assert step == 2 * k, f"第 {k} 帧步数错误: {step}"
+            assert np.array_equal(positions, expected), f"第 {step} 步数据不一致"
+        assert reader.at_step(7)[0] == 6, "按步数定位错误"
+        print(f"轨迹验证通过 - 共 {len(reader)} 帧, 末帧步数 {reader.frame(-1)[0]}")
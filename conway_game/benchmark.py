@@ -0,0 +1,55 @@
+import argparse
+import time
+import numpy as np
+from core.grid_system import ToroidalGrid
+from core.bitboard import BitboardGrid
+from core.parallel_grid import ParallelToroidalGrid
+
+def _random_cells(size: int, density: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.random((size, size)) < density).astype(np.uint8)
+
+def time_steps(grid, steps: int) -> float:
+    """返回每代平均耗时（秒），先预热一代"""
+    grid.step()
+    start = time.perf_counter()
+    if hasattr(grid, 'run'):
+        grid.run(steps)
+    else:
+        for _ in range(steps):
+            grid.step()
+    return (time.perf_counter() - start) / steps
+
+def bench_size(size: int, steps: int, density: float, workers):
+    """对比单核稠密、位压缩与多进程行带后端，返回 {名称: 每代耗时}"""
+    cells = _random_cells(size, density)
+    results = {}
+
+    # 并行后端不收集步进内统计，基准也关闭以保证加速比可比
+    grid = ToroidalGrid(size, size, toroidal=True, collect_stats=False)
+    grid.cells = cells.copy()
+    results['dense'] = time_steps(grid, steps)
+
+    results['bitboard'] = time_steps(BitboardGrid.from_dense(cells, toroidal=True), steps)
+
+    for n in workers:
+        with ParallelToroidalGrid(size, size, toroidal=True, num_workers=n) as grid:
+            grid.cells = cells.copy()
+            results[f'parallel x{n}'] = time_steps(grid, steps)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='生命游戏步进性能基准')
+    parser.add_argument('--sizes', default='1024,4096', help='网格边长列表')
+    parser.add_argument('--steps', type=int, default=20)
+    parser.add_argument('--density', type=float, default=0.3)
+    parser.add_argument('--workers', default='1,2,4,8', help='并行工作进程数列表')
+    args = parser.parse_args()
+
+    for size in [int(v) for v in args.sizes.split(',')]:
+        results = bench_size(size, args.steps, args.density,
+                             [int(v) for v in args.workers.split(',')])
+        baseline = results['dense']
+        for name, seconds in results.items():
+            print(f"{size:>6}² {name:<12} {seconds * 1e3:9.2f} ms/代  "
+                  f"{1 / seconds:9.1f} 代/秒  加速比 x{baseline / seconds:.2f}")
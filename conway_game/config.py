@@ -9,7 +9,20 @@ class Config:
     
     # 演化参数
     INIT_DENSITY = 0.15    # 随机初始化密度
+    RULE = "B3/S23"        # 类Life规则串（如 "B36/S23" HighLife、"B2/S" Seeds）
     TOROIDAL_BOUNDARY = True  # 环形边界
+    GRID_BACKEND = "dense"    # 网格后端: "dense"（每格1字节）、"bitboard"（每格1位）、"parallel"（多进程行带）或 "hashlife" / "sparse"（无界平面）
+    ACTIVE_TILES = False      # 仅重算活跃块（适合稀疏或趋于稳定的网格）
+    TILE_SIZE = 32            # 活跃区域分块边长
+    ACTIVE_TILE_DENSE_FRACTION = 0.5  # 活跃块占比超过该值时退回整网格计算
+    PARALLEL_WORKERS = None   # 并行步进的工作进程数（None 为CPU核数）
+    HASHLIFE_MAX_NODES = 2_000_000  # HashLife节点缓存上限
+    HASHLIFE_STEP_EXPONENT = 0      # HashLife每帧推进 2**k 代
+    MAX_GENERATIONS = 1000    # 模拟总代数
+    RUN_MODE = "sync"         # "sync" 逐代渲染, "decoupled" 后台全速演化+限帧渲染, "headless" 无界面批处理
+    CYCLE_DETECTION = True    # 检测灭绝/静物/周期振荡
+    CYCLE_HISTORY_SIZE = 256  # 哈希历史表容量（即可检测的最大周期）
+    CYCLE_ACTION = "stop"     # 检测到周期后: "stop" 停止, "fast_forward" 快进至终代, "report" 仅记录
     
     # 可视化参数
     COLOR_ALIVE = 'black'
@@ -18,11 +31,25 @@ class Config:
     # 新增统计配置
     STATS_ENABLED = True
     STATS_HISTORY_SIZE = 200  # 保留的历史数据量
+    STATS_HEATMAP = True      # 统计图显示活跃度热图（仅在连接统计图时由网格维护，无界面运行不计算）
+    STATS_HEAT_DECAY = 0.9    # 活跃度热图每代衰减系数
+    STATS_REFRESH_EVERY = 5   # 统计图每N帧重绘一次
     
     # GIF导出配置
     GIF_EXPORT_PATH = Path("exports/animations")
     GIF_FILENAME = "conway_evolution.gif"
     GIF_FPS = 5
+    GIF_STREAMING = True   # 直接由细胞数组流式编码（否则逐帧截取matplotlib画布）
+    GIF_FRAME_EVERY = 1    # 帧抽取间隔（每N代写入一帧）
+    
+    # 批量随机汤搜索
+    SOUP_SIZE = 16             # 单个汤的边长
+    SOUP_BATCH_SIZE = 1024     # 同时演化的汤数
+    SOUP_MAX_GENERATIONS = 5000  # 单个汤的最大演化代数
+    SOUP_MAX_PERIOD = 32       # 可识别的最大周期
+    
+    # 图案库目录（.rle / .cells 文件）
+    PATTERN_DIR = Path(__file__).parent / "patterns"
     
     # 日志配置
     LOG_PATH = Path("logs/conway.log")
\ No newline at end of file
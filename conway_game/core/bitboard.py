@@ -0,0 +1,156 @@
+import numpy as np
+from config import Config
+from core.game_rules import CONWAY_TABLE, compile_rule
+
+WORD_BITS = 64
+_ONE = np.uint64(1)
+_SHIFT_MSB = np.uint64(WORD_BITS - 1)
+
+def _popcount(words: np.ndarray) -> int:
+    """统计置位数（优先使用NumPy原生popcount）"""
+    if hasattr(np, 'bitwise_count'):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+    return int(np.unpackbits(words.view(np.uint8)).sum(dtype=np.int64))
+
+class BitboardGrid:
+    """位压缩网格: 每个uint64字存储64个细胞，按位全加器逻辑整字演化"""
+    def __init__(self, width: int = None, height: int = None, toroidal: bool = None,
+                 band_rows: int = 1024, rule: str = None):
+        self.rule = rule or Config.RULE
+        if not self.supports_rule(self.rule):
+            raise ValueError(f"位压缩后端的加法器逻辑仅支持 B3/S23: {self.rule}")
+        self.width = width or Config.GRID_WIDTH
+        self.height = height or Config.GRID_HEIGHT
+        self.toroidal = Config.TOROIDAL_BOUNDARY if toroidal is None else toroidal
+        self.band_rows = band_rows  # 分带计算以限制临时内存
+        self.num_words = (self.width + WORD_BITS - 1) // WORD_BITS
+        # 第 k 个字的第 b 位对应第 64k+b 列
+        self.words = np.zeros((self.height, self.num_words), dtype='<u8')
+        self._next = np.zeros_like(self.words)
+        self.generation = 0
+
+        # 行尾字中有效位的最高位位置及其掩码（宽度非64倍数时的填充位恒为0）
+        self._last_bit = np.uint64((self.width - 1) % WORD_BITS)
+        tail_bits = self.width - (self.num_words - 1) * WORD_BITS
+        self._tail_mask = np.uint64((1 << tail_bits) - 1) if tail_bits < WORD_BITS else ~np.uint64(0)
+
+    @staticmethod
+    def supports_rule(rule: str) -> bool:
+        """加法器逻辑是否可实现该规则（仅 B3/S23 及其等价写法）"""
+        return np.array_equal(compile_rule(rule), CONWAY_TABLE)
+
+    @classmethod
+    def from_dense(cls, cells: np.ndarray, toroidal: bool = None, rule: str = None) -> "BitboardGrid":
+        """由稠密0/1数组构建"""
+        height, width = cells.shape
+        grid = cls(width, height, toroidal, rule=rule)
+        grid.set_cells(cells)
+        return grid
+
+    @classmethod
+    def from_grid(cls, grid) -> "BitboardGrid":
+        """由 ToroidalGrid 构建（保留边界设置与代数）"""
+        bitboard = cls.from_dense(grid.cells, grid.toroidal, getattr(grid, 'rule', None))
+        bitboard.generation = getattr(grid, 'generation', 0)
+        return bitboard
+
+    def set_cells(self, cells: np.ndarray):
+        """写入稠密0/1数组"""
+        if cells.shape != (self.height, self.width):
+            raise ValueError(f"形状不匹配: {cells.shape} != {(self.height, self.width)}")
+        for r0 in range(0, self.height, self.band_rows):
+            self.words[r0:r0 + self.band_rows] = self._pack(cells[r0:r0 + self.band_rows])
+
+    def _pack(self, rows: np.ndarray) -> np.ndarray:
+        """将若干行0/1数组压缩为字数组"""
+        packed = np.packbits(rows.astype(bool), axis=1, bitorder='little')
+        padded = np.zeros((rows.shape[0], self.num_words * 8), dtype=np.uint8)
+        padded[:, :packed.shape[1]] = packed
+        return padded.view('<u8')
+
+    def to_dense(self, rows: slice = slice(None)) -> np.ndarray:
+        """解压为稠密uint8数组（可只解压部分行）"""
+        return np.unpackbits(self.words[rows].view(np.uint8), axis=1,
+                             count=self.width, bitorder='little')
+
+    @property
+    def cells(self) -> np.ndarray:
+        """稠密视图（每次调用解压一份拷贝，供可视化使用）"""
+        return self.to_dense()
+
+    def population(self) -> int:
+        """存活细胞总数"""
+        return _popcount(self.words)
+
+    def random_init(self, density: float = None, seed: int = None):
+        """按带随机初始化，避免生成整幅稠密数组"""
+        density = Config.INIT_DENSITY if density is None else density
+        rng = np.random.default_rng(seed)
+        for r0 in range(0, self.height, self.band_rows):
+            rows = min(self.band_rows, self.height - r0)
+            self.words[r0:r0 + rows] = self._pack(rng.random((rows, self.width)) < density)
+
+    def _west(self, a: np.ndarray) -> np.ndarray:
+        """每个位置取左侧 (x-1) 邻居"""
+        out = a << _ONE
+        out[:, 1:] |= a[:, :-1] >> _SHIFT_MSB
+        if self.toroidal:
+            out[:, 0] |= (a[:, -1] >> self._last_bit) & _ONE
+        return out
+
+    def _east(self, a: np.ndarray) -> np.ndarray:
+        """每个位置取右侧 (x+1) 邻居"""
+        out = a >> _ONE
+        out[:, :-1] |= a[:, 1:] << _SHIFT_MSB
+        if self.toroidal:
+            out[:, -1] |= (a[:, 0] & _ONE) << self._last_bit
+        return out
+
+    def _band_with_halo(self, r0: int, r1: int) -> np.ndarray:
+        """取出 [r0-1, r1] 行（环形时上下回绕，否则以空行补齐）"""
+        if self.toroidal:
+            idx = np.arange(r0 - 1, r1 + 1) % self.height
+            return self.words[idx]
+        band = np.zeros((r1 - r0 + 2, self.num_words), dtype=self.words.dtype)
+        lo, hi = max(r0 - 1, 0), min(r1 + 1, self.height)
+        band[lo - (r0 - 1):hi - (r0 - 1)] = self.words[lo:hi]
+        return band
+
+    def _step_band(self, r0: int, r1: int) -> np.ndarray:
+        """以位并行加法器计算 [r0, r1) 行的下一代"""
+        ext = self._band_with_halo(r0, r1)
+        west, east = self._west(ext), self._east(ext)
+
+        # 每行水平三格和（含自身）: 2位数 (s1, s0)
+        s0 = west ^ ext ^ east
+        s1 = (west & ext) | (east & (west ^ ext))
+        # 中间行左右两格和（不含自身）: (m1, m0)
+        m0 = west[1:-1] ^ east[1:-1]
+        m1 = west[1:-1] & east[1:-1]
+
+        # 上一行 + 下一行: 3位数 (x2, x1, x0)
+        t0, t1, b0, b1 = s0[:-2], s1[:-2], s0[2:], s1[2:]
+        x0 = t0 ^ b0
+        c0 = t0 & b0
+        x1 = t1 ^ b1 ^ c0
+        x2 = (t1 & b1) | (c0 & (t1 ^ b1))
+
+        # 再加中间行: 只需判断总数是否为2或3
+        y0 = x0 ^ m0
+        d0 = x0 & m0
+        y1 = x1 ^ m1 ^ d0
+        d1 = (x1 & m1) | (d0 & (x1 ^ m1))
+        at_least_four = x2 | d1
+
+        alive = ext[1:-1]
+        nxt = y1 & ~at_least_four & (y0 | alive)
+        nxt[:, -1] &= self._tail_mask
+        return nxt
+
+    def step(self):
+        """演化一代（分带计算后交换双缓冲）"""
+        for r0 in range(0, self.height, self.band_rows):
+            r1 = min(r0 + self.band_rows, self.height)
+            self._next[r0:r1] = self._step_band(r0, r1)
+        self.words, self._next = self._next, self.words
+        self.generation += 1
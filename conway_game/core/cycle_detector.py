@@ -0,0 +1,136 @@
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
+from config import Config
+
+_HASH_BASE = np.uint64(0x100000001B3)  # 多项式滚动哈希的基数
+
+@lru_cache(maxsize=8)
+def _hash_powers(n: int) -> np.ndarray:
+    """B^(n-1-i) mod 2^64（uint64 乘法按 2^64 取模回绕）"""
+    powers = np.full(n, _HASH_BASE, dtype=np.uint64)
+    powers[-1:] = 1
+    return np.multiply.accumulate(powers[::-1])[::-1].copy()
+
+def hash_rows(packed: np.ndarray) -> np.ndarray:
+    """
+    对每行压缩字节计算64位多项式滚动哈希 sum(w_i * B^(n-1-i)) mod 2^64，并以 splitmix64 终混
+    Args:
+        packed: (K, nbytes) uint8
+    Returns:
+        hashes: (K,) uint64
+    """
+    pad = (-packed.shape[1]) % 8
+    if pad:
+        packed = np.concatenate((packed, np.zeros((len(packed), pad), dtype=np.uint8)), axis=1)
+    words = np.ascontiguousarray(packed).view('<u8')
+    h = np.sum(words * _hash_powers(words.shape[1]), axis=1, dtype=np.uint64)
+    h ^= np.uint64(packed.shape[1])
+    h ^= h >> np.uint64(30)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    h ^= h >> np.uint64(27)
+    h *= np.uint64(0x94D049BB133111EB)
+    h ^= h >> np.uint64(31)
+    return h
+
+@dataclass(frozen=True)
+class CycleReport:
+    """检测结果"""
+    kind: str               # "extinct" / "still" / "oscillator"
+    period: int             # 周期（灭绝与静物为1）
+    start_generation: int   # 进入该状态的第一代
+    detected_at: int        # 检测到时的代数
+
+class CycleDetector:
+    """周期与静物检测: 对每代压缩网格做64位哈希，存入有界历史表，命中时逐字节校验"""
+    def __init__(self, history_size: int = None):
+        # 可检测的最大周期等于历史表容量（表中保存压缩网格副本用于碰撞校验）
+        self.history_size = history_size or Config.CYCLE_HISTORY_SIZE
+        self._table = {}        # 哈希 -> (代数, 压缩网格或HashLife的 (根节点, 原点))
+        self._order = deque()   # 按插入顺序淘汰
+        self.report = None
+
+    @staticmethod
+    def packed_state(grid) -> np.ndarray:
+        """取网格的压缩字节表示（位压缩/稀疏后端直接复用其内部存储）"""
+        if hasattr(grid, 'words'):
+            return grid.words.view(np.uint8).ravel()
+        if hasattr(grid, 'keys'):
+            return grid.keys.view(np.uint8)
+        return np.packbits(grid.cells, axis=None)
+
+    @staticmethod
+    def hash_state(packed: np.ndarray) -> int:
+        """压缩网格的64位哈希"""
+        return int(hash_rows(packed[None])[0])
+
+    def observe(self, grid) -> CycleReport:
+        """
+        记录当前代并检测周期
+        Returns:
+            report: 首次检测到灭绝/静物/振荡时返回结果，否则返回 None
+        """
+        if self.report is not None:
+            return None
+        generation = grid.generation
+        if hasattr(grid, 'root'):
+            # HashLife: cells 只是视口，改用完整图案判定；以节点的结构哈希与原点为键
+            # （结构哈希由内容决定，节点表回收后仍一致），命中后再按内容校验
+            empty = grid.population == 0
+            h, state = (grid.root.key, grid.origin), (grid.root, grid.origin)
+        else:
+            state = self.packed_state(grid)
+            empty = not state.any()
+            h = self.hash_state(state)
+        if empty:
+            # 逐代观测时，首次观测到空网格的这一代即灭绝开始
+            self.report = CycleReport("extinct", 1, generation, generation)
+            return self.report
+
+        seen = self._table.get(h)
+        if seen is not None and self._same_state(grid, seen[1], state):
+            start, period = seen[0], generation - seen[0]
+            if hasattr(grid, 'peek'):
+                period = self._minimal_period(grid, period)
+            self.report = CycleReport("still" if period == 1 else "oscillator", period, start, generation)
+            return self.report
+
+        # 哈希碰撞（内容不同）时以新状态覆盖旧条目
+        if h not in self._table:
+            self._order.append(h)
+        self._table[h] = (generation, state.copy() if isinstance(state, np.ndarray) else state)
+        while len(self._order) > self.history_size:
+            self._table.pop(self._order.popleft(), None)
+        return None
+
+    @staticmethod
+    def _same_state(grid, stored, state) -> bool:
+        if isinstance(state, np.ndarray):
+            return np.array_equal(stored, state)
+        return grid.same_pattern(stored, state)
+
+    @staticmethod
+    def _minimal_period(grid, period: int) -> int:
+        """
+        每次 step 推进多代时，观测到的重复间隔只是真实周期的倍数:
+        按从小到大的约数试算推进，首个回到当前图案的代数即真实周期（静物为1）
+        """
+        current = (grid.root, grid.origin)
+        for d in range(1, period):
+            if period % d == 0 and grid.same_pattern(grid.peek(d), current):
+                return d
+        return period
+
+    def fast_forward(self, grid, target_generation: int):
+        """已进入周期时，将代数直接推进到不超过目标且相位一致的代（剩余不足一个周期的代数仍需演化）"""
+        if self.report is None:
+            return
+        period = self.report.period
+        grid.generation += (target_generation - grid.generation) // period * period
+
+    def reset(self):
+        """清空历史（网格被外部修改后调用）"""
+        self._table.clear()
+        self._order.clear()
+        self.report = None
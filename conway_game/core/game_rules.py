@@ -1,6 +1,67 @@
+import re
+import numpy as np
+
 def conway_rule(current_state: int, neighbors: int) -> int:
     """康威生命游戏核心规则[1,5](@ref)"""
     if current_state == 1:
         return 1 if 2 <= neighbors <= 3 else 0
     else:
-        return 1 if neighbors == 3 else 0
\ No newline at end of file
+        return 1 if neighbors == 3 else 0
+
+def apply_conway_rule(cells: np.ndarray, counts: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """康威规则的数组版本: (邻居数 | 自身状态) == 3 等价于 B3/S23，全程原地计算"""
+    if out is None:
+        out = np.empty_like(cells)
+    np.bitwise_or(counts, cells, out=out)
+    np.equal(out, 3, out=out, casting='unsafe')
+    return out
+
+CONWAY_RULE = "B3/S23"
+_RULE_BS = re.compile(r'^B([0-8]*)/?S([0-8]*)$', re.IGNORECASE)
+_RULE_SB = re.compile(r'^([0-8]*)/([0-8]*)$')
+
+def parse_rulestring(rule: str):
+    """解析类Life规则串（"B36/S23"、"B2/S" 或 S/B 写法 "23/36"），返回 (出生邻居数集合, 存活邻居数集合)"""
+    text = rule.strip().replace(' ', '')
+    match = _RULE_BS.match(text)
+    if match:
+        births, survivals = match.groups()
+    else:
+        match = _RULE_SB.match(text)
+        if not match:
+            raise ValueError(f"无法解析的规则串: {rule!r}")
+        survivals, births = match.groups()
+    return frozenset(map(int, births)), frozenset(map(int, survivals))
+
+def compile_rule(rule: str) -> np.ndarray:
+    """将规则串编译为 (状态, 邻居数) -> 下一状态 的 2x9 查找表"""
+    births, survivals = parse_rulestring(rule)
+    table = np.zeros((2, 9), dtype=np.uint8)
+    table[0, sorted(births)] = 1
+    table[1, sorted(survivals)] = 1
+    return table
+
+CONWAY_TABLE = compile_rule(CONWAY_RULE)
+
+def apply_rule_table(table: np.ndarray, cells: np.ndarray, counts: np.ndarray,
+                     out: np.ndarray = None) -> np.ndarray:
+    """
+    按查找表演化: 每格取所在状态的8位掩码并右移邻居数位，一次向量化完成查表
+    （比 np.take 按下标gather快数倍；邻居数为8的条目仅在规则用到时单独处理）
+    """
+    if out is None:
+        out = np.empty_like(cells)
+    if np.array_equal(table, CONWAY_TABLE):
+        return apply_conway_rule(cells, counts, out=out)
+    weights = 1 << np.arange(8)
+    birth_mask = np.uint8(int(table[0, :8] @ weights))
+    survive_mask = np.uint8(int(table[1, :8] @ weights))
+    # 掩码 = 出生掩码 ^ (存活掩码 ^ 出生掩码) * 自身状态
+    np.multiply(cells, birth_mask ^ survive_mask, out=out)
+    np.bitwise_xor(out, birth_mask, out=out)
+    np.right_shift(out, counts, out=out)  # 邻居数为8时移出全部位得0
+    np.bitwise_and(out, 1, out=out)
+    if table[:, 8].any():
+        eight = (cells * (table[0, 8] ^ table[1, 8])) ^ table[0, 8]
+        np.copyto(out, eight, where=counts == 8)
+    return out
@@ -1,12 +1,42 @@
 import numpy as np
 from config import Config
+from core.game_rules import apply_rule_table, compile_rule
+from core.step_stats import StepStats
 
 class ToroidalGrid:
     """实现环形边界的网格系统[2,8](@ref)"""
-    def __init__(self):
-        self.width = Config.GRID_WIDTH
-        self.height = Config.GRID_HEIGHT
+    def __init__(self, width: int = None, height: int = None, toroidal: bool = None,
+                 active_tiles: bool = None, tile_size: int = None, rule: str = None,
+                 collect_stats: bool = False):
+        self.width = width or Config.GRID_WIDTH
+        self.height = height or Config.GRID_HEIGHT
+        self.toroidal = Config.TOROIDAL_BOUNDARY if toroidal is None else toroidal
+        self.rule = rule or Config.RULE
+        self.rule_table = compile_rule(self.rule)  # (状态, 邻居数) 查找表
         self.cells = np.zeros((self.height, self.width), dtype=np.uint8)
+        self.generation = 0
+        self._alloc_buffers()
+        
+        # 活跃区域分块: 仅重算上一代发生变化的块及其相邻块
+        self.active_tiles = Config.ACTIVE_TILES if active_tiles is None else active_tiles
+        self.tile_size = tile_size or Config.TILE_SIZE
+        self._tile_rows = np.arange(0, self.height, self.tile_size)
+        self._tile_cols = np.arange(0, self.width, self.tile_size)
+        self._changed = np.ones((len(self._tile_rows), len(self._tile_cols)), dtype=bool)
+        self.active_tile_count = self._changed.size  # 上一代实际重算的块数
+        
+        # 步进内统计（出生/死亡/存活数与活跃度热图），默认关闭，由统计图连接时开启
+        self.stats = StepStats((self.height, self.width)) if collect_stats else None
+        self._population = None  # 上一代存活数（未知时于下一次步进计数）
+    
+    def _alloc_buffers(self):
+        """预分配步进缓冲区（双缓冲 + 邻居计数）"""
+        h, w = self.height, self.width
+        self._next = np.zeros((h, w), dtype=np.uint8)
+        self._padded = np.zeros((h + 2, w + 2), dtype=np.uint8)  # 带一圈边界的副本
+        self._row_sums = np.zeros((h + 2, w), dtype=np.uint8)    # 水平三格和
+        self.counts = np.zeros((h, w), dtype=np.uint8)           # 8邻域存活数
+        self._diff = np.zeros((h, w), dtype=np.uint8)            # 本代变化格（统计用）
     
     def get_neighbors_count(self, x: int, y: int) -> int:
         """计算8邻域存活细胞数（支持环形边界）[8](@ref)"""
@@ -15,10 +45,154 @@ class ToroidalGrid:
         neighbors = self.cells[np.ix_(y_indices, x_indices)]
         return np.sum(neighbors) - self.cells[y, x]
     
+    def compute_neighbor_counts(self) -> np.ndarray:
+        """一次性计算全网格8邻域存活数，写入 self.counts"""
+        padded, cells = self._padded, self.cells
+        padded[1:-1, 1:-1] = cells
+        if self.toroidal:
+            # 先复制首尾行，再复制首尾列（同时覆盖四角）
+            padded[0, 1:-1] = cells[-1]
+            padded[-1, 1:-1] = cells[0]
+            padded[:, 0] = padded[:, -2]
+            padded[:, -1] = padded[:, 1]
+        # 非环形边界时外圈保持为0（死细胞）
+        
+        # 可分离求和: 先水平三格，再垂直三格，得到含自身的3x3和
+        rows = self._row_sums
+        np.add(padded[:, :-2], padded[:, 1:-1], out=rows)
+        rows += padded[:, 2:]
+        counts = self.counts
+        np.add(rows[:-2], rows[1:-1], out=counts)
+        counts += rows[2:]
+        counts -= cells
+        return counts
+    
+    def step(self):
+        """向量化演化一代（双缓冲交换，无逐格Python循环）"""
+        if self.active_tiles:
+            self._step_tiled()
+        else:
+            self._step_dense()
+        self.generation += 1
+    
+    def _step_dense(self):
+        counts = self.compute_neighbor_counts()
+        apply_rule_table(self.rule_table, self.cells, counts, out=self._next)
+        if self.stats is not None:
+            self._collect_dense_stats(self.cells, self._next)
+        self.cells, self._next = self._next, self.cells
+    
+    def _previous_population(self, cells: np.ndarray) -> int:
+        if self._population is None:
+            self._population = int(np.count_nonzero(cells))
+        return self._population
+    
+    def _record_stats(self, population: int, changed: int):
+        """由存活数增量与变化格数解出出生/死亡数: 出生+死亡=变化数，出生-死亡=增量"""
+        delta = population - self._population
+        births = (changed + delta) // 2
+        self.stats.record(self.generation + 1, population, births, changed - births)
+        self._population = population
+    
+    def _collect_dense_stats(self, old: np.ndarray, new: np.ndarray):
+        """整网格统计: 一次异或得到变化格，两次计数归约"""
+        self._previous_population(old)
+        diff = np.bitwise_xor(old, new, out=self._diff).view(bool)
+        self.stats.begin_generation()
+        self.stats.add_activity(diff)
+        self._record_stats(int(np.count_nonzero(new)), int(np.count_nonzero(diff)))
+    
+    def enable_stats(self) -> StepStats:
+        """开始收集步进内统计（每代增加一次异或与两次计数，无界面运行保持关闭）"""
+        if self.stats is None:
+            self.stats = StepStats((self.height, self.width))
+            self._population = None
+        return self.stats
+    
+    def invalidate(self):
+        """外部直接修改 cells 后调用，使下一代重算全部块"""
+        self._changed[:] = True
+        self._population = None
+    
+    def _tiles_changed(self, old: np.ndarray, new: np.ndarray) -> np.ndarray:
+        """按块归约差异，得到每块是否变化"""
+        diff = old != new
+        diff = np.logical_or.reduceat(diff, self._tile_rows, axis=0)
+        return np.logical_or.reduceat(diff, self._tile_cols, axis=1)
+    
+    def _dilate_tiles(self, tiles: np.ndarray) -> np.ndarray:
+        """将变化块扩展到其8邻域块"""
+        if self.toroidal:
+            rows = tiles | np.roll(tiles, 1, axis=0) | np.roll(tiles, -1, axis=0)
+            return rows | np.roll(rows, 1, axis=1) | np.roll(rows, -1, axis=1)
+        padded = np.pad(tiles, 1)
+        rows = padded[:-2] | padded[1:-1] | padded[2:]
+        return rows[:, :-2] | rows[:, 1:-1] | rows[:, 2:]
+    
+    def _block_with_halo(self, r0: int, r1: int, c0: int, c1: int) -> np.ndarray:
+        """取出 [r0-1, r1] x [c0-1, c1] 区域（环形时回绕，否则以死细胞补齐）"""
+        if self.toroidal:
+            rows = np.arange(r0 - 1, r1 + 1) % self.height
+            cols = np.arange(c0 - 1, c1 + 1) % self.width
+            return self.cells[np.ix_(rows, cols)]
+        block = np.zeros((r1 - r0 + 2, c1 - c0 + 2), dtype=np.uint8)
+        lo_r, hi_r = max(r0 - 1, 0), min(r1 + 1, self.height)
+        lo_c, hi_c = max(c0 - 1, 0), min(c1 + 1, self.width)
+        block[lo_r - r0 + 1:hi_r - r0 + 1, lo_c - c0 + 1:hi_c - c0 + 1] = self.cells[lo_r:hi_r, lo_c:hi_c]
+        return block
+    
+    def _step_tiled(self):
+        """仅重算活跃块（同一块行内连续的活跃块合并为一次向量化计算）"""
+        active = self._dilate_tiles(self._changed)
+        self.active_tile_count = int(active.sum())
+        if self.active_tile_count > Config.ACTIVE_TILE_DENSE_FRACTION * active.size:
+            # 活跃块过多时整网格计算更快
+            self._step_dense()
+            self._changed = self._tiles_changed(self._next, self.cells)
+            return
+        
+        t = self.tile_size
+        updates = []
+        changed = np.zeros_like(self._changed)
+        stats = self.stats
+        if stats is not None:
+            # 未重算的块不变，只需累计活跃块内的变化
+            population = self._previous_population(self.cells)
+            changed_cells = 0
+            stats.begin_generation()
+        for ty in np.flatnonzero(active.any(axis=1)):
+            # 找出该块行中连续活跃块的区间
+            edges = np.diff(np.concatenate(([0], active[ty].view(np.int8), [0])))
+            starts, stops = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+            r0, r1 = ty * t, min((ty + 1) * t, self.height)
+            for tx0, tx1 in zip(starts, stops):
+                c0, c1 = tx0 * t, min(tx1 * t, self.width)
+                block = self._block_with_halo(r0, r1, c0, c1)
+                rows = block[:, :-2] + block[:, 1:-1] + block[:, 2:]
+                counts = rows[:-2] + rows[1:-1] + rows[2:]
+                inner = block[1:-1, 1:-1]
+                counts -= inner
+                new = apply_rule_table(self.rule_table, inner, counts)
+                block_diff = new != inner
+                if stats is not None:
+                    stats.add_activity(block_diff, slice(r0, r1), slice(c0, c1))
+                    changed_cells += int(np.count_nonzero(block_diff))
+                    population += int(np.count_nonzero(new)) - int(np.count_nonzero(inner))
+                diff = np.logical_or.reduceat(block_diff, np.arange(0, c1 - c0, t), axis=1)
+                changed[ty, tx0:tx1] = diff.any(axis=0)
+                updates.append((r0, r1, c0, c1, new))
+        # 全部块计算完成后再写回，保证读取的都是上一代状态
+        for r0, r1, c0, c1, new in updates:
+            self.cells[r0:r1, c0:c1] = new
+        self._changed = changed
+        if stats is not None:
+            self._record_stats(population, changed_cells)
+    
     def random_init(self):
         """随机初始化网格[3,9](@ref)"""
         self.cells = np.random.choice(
             [0, 1], 
             size=(self.height, self.width),
             p=[1-Config.INIT_DENSITY, Config.INIT_DENSITY]
-        )
\ No newline at end of file
+        ).astype(np.uint8)
+        self.invalidate()
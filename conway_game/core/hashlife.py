@@ -0,0 +1,289 @@
+import numpy as np
+from config import Config
+from core.game_rules import compile_rule
+
+class Node:
+    """四叉树节点（哈希一致化后同构子树唯一，可按身份比较）"""
+    __slots__ = ('nw', 'ne', 'sw', 'se', 'level', 'population', 'memo', 'key')
+
+    def __init__(self, nw, ne, sw, se, level: int, population: int, key: int):
+        self.nw, self.ne, self.sw, self.se = nw, ne, sw, se
+        self.level = level            # 边长为 2**level
+        self.population = population  # 存活细胞数（Python整数，不会溢出）
+        self.memo = None              # {j: 推进 2**j 代后的中心结果}
+        self.key = key                # 由内容递归得到的结构哈希（与节点身份无关，回收后不变）
+
+DEAD = Node(None, None, None, None, 0, 0, 0)
+ALIVE = Node(None, None, None, None, 0, 1, 1)
+
+def nodes_equal(a: Node, b: Node) -> bool:
+    """按内容比较两棵子树（同一对象直接相等，结构哈希不同直接不等）"""
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        if x is y:
+            continue
+        if x.key != y.key or x.level != y.level or x.population != y.population or x.level == 0:
+            return False
+        stack.extend(((x.nw, y.nw), (x.ne, y.ne), (x.sw, y.sw), (x.se, y.se)))
+    return True
+
+class HashLifeEngine:
+    """HashLife引擎: 哈希一致化四叉树 + 结果记忆化，支持2的幂次代跳跃[1](@ref)"""
+    def __init__(self, max_nodes: int = None, step_exponent: int = None, rule: str = None):
+        self.rule = rule or Config.RULE
+        self.rule_table = compile_rule(self.rule)
+        if self.rule_table[0, 0]:
+            raise ValueError(f"无界平面不支持 B0 规则: {self.rule}")
+        self.max_nodes = max_nodes or Config.HASHLIFE_MAX_NODES  # 节点表上限，超出后触发回收
+        self._gc_threshold = self.max_nodes  # 当前回收阈值（回收后按存活规模上调，避免反复回收）
+        # step() 每次推进 2**step_exponent 代
+        self.step_exponent = Config.HASHLIFE_STEP_EXPONENT if step_exponent is None else step_exponent
+        self._table = {}
+        self._empty = [DEAD]
+        self.root = self._empty_node(3)
+        self.origin = (0, 0)            # 根节点左上角的 (x, y) 坐标
+        self.generation = 0
+        self.gc_count = 0
+        self._pinned = []               # 回收时额外保留的根节点（如试算前的状态）
+        self.viewport = (0, 0, 0, 0)    # 导出稠密数组的区域 (x, y, 宽, 高)
+
+    # ---------- 节点构造 ----------
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """哈希一致化地组合四个同级子节点"""
+        key = (nw, ne, sw, se)
+        node = self._table.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population + sw.population + se.population,
+                        hash((nw.key, ne.key, sw.key, se.key)))
+            self._table[key] = node
+        return node
+
+    def _empty_node(self, level: int) -> Node:
+        """指定级别的空节点"""
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def _centre(self, n: Node) -> Node:
+        return self.join(n.nw.se, n.ne.sw, n.sw.ne, n.se.nw)
+
+    # ---------- 演化核心 ----------
+    def _life_4x4(self, n: Node) -> Node:
+        """基础情形: 4x4 节点中心 2x2 演化一代"""
+        bits = [[n.nw.nw, n.nw.ne, n.ne.nw, n.ne.ne],
+                [n.nw.sw, n.nw.se, n.ne.sw, n.ne.se],
+                [n.sw.nw, n.sw.ne, n.se.nw, n.se.ne],
+                [n.sw.sw, n.sw.se, n.se.sw, n.se.se]]
+        bits = [[cell.population for cell in row] for row in bits]
+        out = []
+        for y in (1, 2):
+            for x in (1, 2):
+                count = sum(bits[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - bits[y][x]
+                out.append(ALIVE if self.rule_table[bits[y][x], count] else DEAD)
+        return self.join(*out)
+
+    def successor(self, n: Node, j: int) -> Node:
+        """返回 level-k 节点推进 2**j 代 (0 <= j <= k-2) 后的中心 level-(k-1) 节点"""
+        if n.population == 0:
+            return self._empty_node(n.level - 1)
+        if n.memo is not None and j in n.memo:
+            return n.memo[j]
+
+        if n.level == 2:
+            result = self._life_4x4(n)
+        else:
+            join = self.join
+            # 九个相互重叠的 level-(k-1) 子块
+            c = [[n.nw, join(n.nw.ne, n.ne.nw, n.nw.se, n.ne.sw), n.ne],
+                 [join(n.nw.sw, n.nw.se, n.sw.nw, n.sw.ne), self._centre(n),
+                  join(n.ne.sw, n.ne.se, n.se.nw, n.se.ne)],
+                 [n.sw, join(n.sw.ne, n.se.nw, n.sw.se, n.se.sw), n.se]]
+            if j == n.level - 2:
+                # 全速: 两个半程各推进 2**(k-3) 代
+                s = [[self.successor(c[y][x], j - 1) for x in range(3)] for y in range(3)]
+                sub_j = j - 1
+            else:
+                # 慢速: 第一阶段只取中心不推进时间
+                s = [[self._centre(c[y][x]) for x in range(3)] for y in range(3)]
+                sub_j = j
+            result = join(
+                self.successor(join(s[0][0], s[0][1], s[1][0], s[1][1]), sub_j),
+                self.successor(join(s[0][1], s[0][2], s[1][1], s[1][2]), sub_j),
+                self.successor(join(s[1][0], s[1][1], s[2][0], s[2][1]), sub_j),
+                self.successor(join(s[1][1], s[1][2], s[2][1], s[2][2]), sub_j),
+            )
+        if n.memo is None:
+            n.memo = {}
+        n.memo[j] = result
+        return result
+
+    def _inner_population(self, n: Node) -> int:
+        """中心 1/4 边长区域内的存活数"""
+        return n.nw.se.se.population + n.ne.sw.sw.population + \
+            n.sw.ne.ne.population + n.se.nw.nw.population
+
+    def _expand(self):
+        """根节点外扩一级（原根位于中心）"""
+        r, e = self.root, self._empty_node(self.root.level - 1)
+        self.root = self.join(self.join(e, e, e, r.nw), self.join(e, e, r.ne, e),
+                              self.join(e, r.sw, e, e), self.join(r.se, e, e, e))
+        half = 1 << (r.level - 1)
+        self.origin = (self.origin[0] - half, self.origin[1] - half)
+
+    def _shrink(self):
+        """外圈为空时收缩根节点，避免级别无限增长"""
+        while self.root.level > 3 and self._centre(self.root).population == self.root.population:
+            quarter = 1 << (self.root.level - 2)
+            self.root = self._centre(self.root)
+            self.origin = (self.origin[0] + quarter, self.origin[1] + quarter)
+
+    def step_pow2(self, j: int):
+        """推进 2**j 代"""
+        # 保证图案位于中心1/4区域且级别足够，结果中心块可完整容纳演化后的图案
+        while self.root.level < j + 3 or self._inner_population(self.root) != self.root.population:
+            self._expand()
+        quarter = 1 << (self.root.level - 2)
+        self.root = self.successor(self.root, j)
+        self.origin = (self.origin[0] + quarter, self.origin[1] + quarter)
+        self.generation += 1 << j
+        self._shrink()
+        if len(self._table) > self._gc_threshold:
+            self.gc()
+
+    def advance(self, generations: int):
+        """推进任意代数（按二进制位分解为2的幂次跳跃）"""
+        j = 0
+        while generations:
+            if generations & 1:
+                self.step_pow2(j)
+            generations >>= 1
+            j += 1
+
+    def step(self):
+        """推进 2**step_exponent 代（与 ToroidalGrid.step 接口一致）"""
+        self.step_pow2(self.step_exponent)
+
+    def peek(self, generations: int):
+        """
+        试算推进若干代后的 (根节点, 原点)，不改变引擎状态（复用并扩充记忆化结果）
+        """
+        saved = self.root, self.origin, self.generation
+        self._pinned.append(saved[0])
+        try:
+            self.advance(generations)
+            return self.root, self.origin
+        finally:
+            self._pinned.pop()
+            self.root, self.origin, self.generation = saved
+
+    def same_pattern(self, a: tuple, b: tuple) -> bool:
+        """
+        比较两个 (根节点, 原点) 表示的完整图案；分帧一致时逐节点比较，
+        否则（演化路径不同导致根节点级别或原点不同）在两者范围的并集上比较稠密内容
+        """
+        (ra, oa), (rb, ob) = a, b
+        if ra.population != rb.population:
+            return False
+        if oa == ob and ra.level == rb.level:
+            return nodes_equal(ra, rb)
+        x0, y0 = min(oa[0], ob[0]), min(oa[1], ob[1])
+        x1 = max(oa[0] + (1 << ra.level), ob[0] + (1 << rb.level))
+        y1 = max(oa[1] + (1 << ra.level), ob[1] + (1 << rb.level))
+        saved = self.root, self.origin
+        try:
+            self.root, self.origin = ra, oa
+            dense_a = self.to_dense(x0, y0, x1 - x0, y1 - y0)
+            self.root, self.origin = rb, ob
+            return np.array_equal(dense_a, self.to_dense(x0, y0, x1 - x0, y1 - y0))
+        finally:
+            self.root, self.origin = saved
+
+    def gc(self):
+        """
+        回收节点缓存: 仅保留根节点可达的节点，记忆化结果仍可达的条目继续保留
+        （结果节点须留在表中，否则再次构造会得到不一致的副本）；
+        回收后阈值上调为存活规模的两倍，避免每代都触发回收
+        """
+        table, stack, seen = {}, [self.root] + self._pinned + self._empty[1:], set()
+        while stack:
+            n = stack.pop()
+            if n.level == 0 or id(n) in seen:
+                continue
+            seen.add(id(n))
+            table[(n.nw, n.ne, n.sw, n.se)] = n
+            stack.extend((n.nw, n.ne, n.sw, n.se))
+        for n in table.values():
+            if n.memo:
+                n.memo = {j: r for j, r in n.memo.items() if r.level == 0 or id(r) in seen} or None
+        self._table = table
+        self._gc_threshold = max(self.max_nodes, 2 * len(table))
+        self.gc_count += 1
+
+    @property
+    def node_count(self) -> int:
+        return len(self._table)
+
+    @property
+    def population(self) -> int:
+        return self.root.population
+
+    # ---------- 稠密数组互转 ----------
+    def set_cells(self, cells: np.ndarray, x0: int = 0, y0: int = 0):
+        """由稠密0/1数组构建四叉树（逐级向量化去重后再哈希一致化）"""
+        h, w = cells.shape
+        level = max(3, int(np.ceil(np.log2(max(h, w, 1)))))
+        size = 1 << level
+        ids = np.zeros((size, size), dtype=np.int64)
+        ids[:h, :w] = cells != 0
+        nodes = [DEAD, ALIVE]
+        for _ in range(level):
+            quads = np.stack([ids[0::2, 0::2], ids[0::2, 1::2], ids[1::2, 0::2], ids[1::2, 1::2]], axis=-1)
+            uniq, inverse = np.unique(quads.reshape(-1, 4), axis=0, return_inverse=True)
+            nodes = [self.join(nodes[a], nodes[b], nodes[c], nodes[d]) for a, b, c, d in uniq]
+            ids = inverse.reshape(quads.shape[:2])
+        self.root = nodes[ids[0, 0]]
+        self.origin = (x0, y0)
+        self.viewport = (x0, y0, w, h)
+
+    @classmethod
+    def from_grid(cls, grid, **kwargs) -> "HashLifeEngine":
+        """由 ToroidalGrid 导入（HashLife为无界平面，不再环绕）"""
+        kwargs.setdefault('rule', getattr(grid, 'rule', None))
+        engine = cls(**kwargs)
+        engine.set_cells(grid.cells)
+        engine.generation = getattr(grid, 'generation', 0)
+        return engine
+
+    def to_dense(self, x0: int, y0: int, width: int, height: int) -> np.ndarray:
+        """导出指定视口的稠密uint8数组"""
+        out = np.zeros((height, width), dtype=np.uint8)
+        stack = [(self.root, self.origin[0], self.origin[1])]
+        while stack:
+            n, nx, ny = stack.pop()
+            size = 1 << n.level
+            if n.population == 0 or nx >= x0 + width or ny >= y0 + height \
+                    or nx + size <= x0 or ny + size <= y0:
+                continue
+            if n.level == 0:
+                out[ny - y0, nx - x0] = 1
+                continue
+            half = size >> 1
+            stack.extend(((n.nw, nx, ny), (n.ne, nx + half, ny),
+                          (n.sw, nx, ny + half), (n.se, nx + half, ny + half)))
+        return out
+
+    @property
+    def cells(self) -> np.ndarray:
+        """视口内的稠密视图，供现有可视化使用"""
+        return self.to_dense(*self.viewport)
+
+    @property
+    def width(self) -> int:
+        return self.viewport[2]
+
+    @property
+    def height(self) -> int:
+        return self.viewport[3]
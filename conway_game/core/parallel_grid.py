@@ -0,0 +1,168 @@
+import os
+import threading
+import traceback
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from config import Config
+from core.grid_system import ToroidalGrid
+from core.game_rules import apply_rule_table
+
+# 控制字: [指令, 本次推进代数]
+_RUN, _STOP = 0, 1
+
+class _BandWorker:
+    """单个行带的演化逻辑（运行于工作进程内，缓冲区一次分配反复使用）"""
+    def __init__(self, buffers, r0: int, r1: int, toroidal: bool, rule_table: np.ndarray):
+        self.buffers = buffers
+        self.rule_table = rule_table
+        self.r0, self.r1 = r0, r1
+        self.toroidal = toroidal
+        h, w = r1 - r0, buffers[0].shape[1]
+        self._padded = np.zeros((h + 2, w + 2), dtype=np.uint8)
+        self._row_sums = np.zeros((h + 2, w), dtype=np.uint8)
+        self._counts = np.zeros((h, w), dtype=np.uint8)
+
+    def step(self, parity: int):
+        """读取 buffers[parity] 中本行带及上下各一行光晕，写入 buffers[1-parity]"""
+        src, dst = self.buffers[parity], self.buffers[1 - parity]
+        height = src.shape[0]
+        r0, r1, padded = self.r0, self.r1, self._padded
+        padded[1:-1, 1:-1] = src[r0:r1]
+        if self.toroidal:
+            padded[0, 1:-1] = src[(r0 - 1) % height]
+            padded[-1, 1:-1] = src[r1 % height]
+            padded[:, 0] = padded[:, -2]
+            padded[:, -1] = padded[:, 1]
+        else:
+            padded[0, 1:-1] = src[r0 - 1] if r0 > 0 else 0
+            padded[-1, 1:-1] = src[r1] if r1 < height else 0
+
+        rows, counts = self._row_sums, self._counts
+        np.add(padded[:, :-2], padded[:, 1:-1], out=rows)
+        rows += padded[:, 2:]
+        np.add(rows[:-2], rows[1:-1], out=counts)
+        counts += rows[2:]
+        counts -= padded[1:-1, 1:-1]
+        apply_rule_table(self.rule_table, padded[1:-1, 1:-1], counts, out=dst[r0:r1])
+
+def _worker_main(names, shape, r0: int, r1: int, toroidal: bool, rule_table, barrier, control):
+    """工作进程主循环: 每代计算本行带后在屏障处同步"""
+    handles = [shared_memory.SharedMemory(name=name) for name in names]
+    buffers = [np.ndarray(shape, dtype=np.uint8, buffer=shm.buf) for shm in handles]
+    worker = _BandWorker(buffers, r0, r1, toroidal, rule_table)
+    parity = 0
+    try:
+        while True:
+            barrier.wait()  # 等待主进程下达指令
+            command, generations = control[0], control[1]
+            if command == _STOP:
+                break
+            for _ in range(generations):
+                worker.step(parity)
+                parity ^= 1
+                barrier.wait()  # 本代全部行带写完后才能进入下一代
+    except Exception:
+        traceback.print_exc()
+        barrier.abort()
+    finally:
+        del worker, buffers
+        for shm in handles:
+            shm.close()
+
+class ParallelToroidalGrid(ToroidalGrid):
+    """多进程行带分解网格: 当前/下一代缓冲位于共享内存，常驻工作进程每代以屏障同步"""
+    def __init__(self, width: int = None, height: int = None, toroidal: bool = None,
+                 num_workers: int = None, rule: str = None):
+        super().__init__(width, height, toroidal, rule=rule)
+        workers = num_workers or Config.PARALLEL_WORKERS or os.cpu_count() or 1
+        self.num_workers = max(1, min(workers, self.height))
+
+        shape = (self.height, self.width)
+        self._shm = [shared_memory.SharedMemory(create=True, size=max(1, self.height * self.width))
+                     for _ in range(2)]
+        self._buffers = [np.ndarray(shape, dtype=np.uint8, buffer=shm.buf) for shm in self._shm]
+        self._buffers[0][...] = self.cells
+        self._parity = 0
+        self.cells = self._buffers[0]
+
+        # 主进程同样参与屏障，屏障即每代的完成信号
+        self._barrier = mp.Barrier(self.num_workers + 1)
+        self._control = mp.Array('q', 2, lock=False)
+        bounds = np.linspace(0, self.height, self.num_workers + 1).astype(int)
+        names = [shm.name for shm in self._shm]
+        self._workers = []
+        for r0, r1 in zip(bounds[:-1], bounds[1:]):
+            proc = mp.Process(target=_worker_main,
+                              args=(names, shape, int(r0), int(r1), self.toroidal,
+                                    self.rule_table, self._barrier, self._control),
+                              daemon=True)
+            proc.start()
+            self._workers.append(proc)
+
+    @classmethod
+    def from_grid(cls, grid, num_workers: int = None) -> "ParallelToroidalGrid":
+        """由 ToroidalGrid 构建（保留边界设置与代数）"""
+        parallel = cls(grid.width, grid.height, grid.toroidal, num_workers, grid.rule)
+        parallel.cells[...] = grid.cells
+        parallel.generation = grid.generation
+        return parallel
+
+    def enable_stats(self):
+        """演化在工作进程中完成，不支持步进内统计（统计图退化为按帧计数存活数）"""
+        return None
+
+    def _sync_cells(self):
+        """cells 被外部整体替换（如 random_init）时拷回共享缓冲"""
+        current = self._buffers[self._parity]
+        if self.cells is not current:
+            current[...] = self.cells
+            self.cells = current
+
+    def run(self, generations: int):
+        """并行推进若干代（工作进程间仅以屏障同步，主进程不搬运数据）"""
+        if not self._workers:
+            raise RuntimeError("工作进程已关闭")
+        self._sync_cells()
+        self._control[0], self._control[1] = _RUN, generations
+        try:
+            self._barrier.wait()
+            for _ in range(generations):
+                self._barrier.wait()
+        except threading.BrokenBarrierError as e:
+            raise RuntimeError("工作进程执行失败") from e
+        self._parity ^= generations & 1
+        self.cells = self._buffers[self._parity]
+        self.generation += generations
+
+    def step(self):
+        """并行演化一代"""
+        self.run(1)
+
+    def close(self):
+        """停止工作进程并释放共享内存"""
+        if self._workers:
+            self._control[0] = _STOP
+            try:
+                self._barrier.wait(timeout=5)
+            except threading.BrokenBarrierError:
+                pass
+            for proc in self._workers:
+                proc.join(timeout=5)
+                if proc.is_alive():
+                    proc.terminate()
+            self._workers = []
+        if self._shm:
+            # 释放前将状态复制回进程私有内存，保证关闭后仍可读取
+            self.cells = np.array(self.cells)
+            self._buffers = []
+            for shm in self._shm:
+                shm.close()
+                shm.unlink()
+            self._shm = []
+
+    def __enter__(self) -> "ParallelToroidalGrid":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
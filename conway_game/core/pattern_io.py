@@ -0,0 +1,204 @@
+import re
+from pathlib import Path
+import numpy as np
+from config import Config
+
+_RLE_HEADER = re.compile(r'x\s*=\s*(\d+)\s*,\s*y\s*=\s*(\d+)(?:\s*,\s*rule\s*=\s*(\S+))?', re.IGNORECASE)
+
+def parse_rle(text: str):
+    """
+    解码RLE图案（全程向量化: 按字节切分游程计数与标签，再以累加和计算每段的行列位置）
+    Returns:
+        (cells, meta): uint8 数组与元信息 {name, rule, comments}
+    """
+    meta = {'name': None, 'rule': None, 'comments': []}
+    width = height = None
+    body = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('#'):
+            if line[1:2] == 'N':
+                meta['name'] = line[2:].strip()
+            elif line[1:2] in ('C', 'c'):
+                meta['comments'].append(line[2:].strip())
+        elif width is None and line.lower().startswith('x'):
+            match = _RLE_HEADER.match(line)
+            if not match:
+                raise ValueError(f"无效的RLE头: {line!r}")
+            width, height = int(match.group(1)), int(match.group(2))
+            meta['rule'] = match.group(3)
+        else:
+            body.append(line)
+    raw = np.frombuffer(''.join(body).split('!', 1)[0].encode('ascii', 'ignore'), dtype=np.uint8)
+    raw = raw[raw > ord(' ')]
+    is_digit = (raw >= ord('0')) & (raw <= ord('9'))
+    tag_pos = np.flatnonzero(~is_digit)
+    if not len(tag_pos):
+        return np.zeros((height or 0, width or 0), dtype=np.uint8), meta
+    tags = raw[tag_pos]
+    # 每个数字按其到后随标签的距离取位权，再按标签归约得到游程长度（缺省为1）
+    digit_pos = np.flatnonzero(is_digit)
+    owner = np.searchsorted(tag_pos, digit_pos)
+    valid = owner < len(tag_pos)
+    digit_pos, owner = digit_pos[valid], owner[valid]
+    values = (raw[digit_pos] - ord('0')).astype(np.int64) * 10 ** (tag_pos[owner] - digit_pos - 1)
+    runs = np.zeros(len(tags), dtype=np.int64)
+    np.add.at(runs, owner, values)
+    runs[np.bincount(owner, minlength=len(tags)) == 0] = 1
+    newline = tags == ord('$')
+    # 每段所在行 = 此前换行数之和；列起点 = 行内此前格数之和
+    rows = np.cumsum(np.where(newline, runs, 0)) - np.where(newline, runs, 0)
+    cell_runs = np.where(newline, 0, runs)
+    ends = np.cumsum(cell_runs)
+    row_start = np.maximum.accumulate(np.where(newline, ends, 0))
+    row_start = np.concatenate(([0], row_start[:-1]))
+    cols = ends - cell_runs - row_start
+
+    alive = ~newline & (tags != ord('b')) & (tags != ord('.'))  # 'o' 及多状态字母均视为存活
+    if alive.any():
+        # 存活格超出头部声明的尺寸时报错，避免平铺下标溢入下一行或越界
+        extent_x = int((cols + cell_runs)[alive].max())
+        extent_y = int(rows[alive].max()) + 1
+        if (width and extent_x > width) or (height and extent_y > height):
+            raise ValueError(f"RLE图案 {meta['name'] or '(未命名)'} 超出头部尺寸 "
+                             f"x = {width}, y = {height}: 实际 {extent_x} x {extent_y}")
+    width = width or int((cols + cell_runs).max())
+    height = height or int(rows.max()) + 1
+    cells = np.zeros((height, width), dtype=np.uint8)
+    counts = runs[alive]
+    starts = (rows * width + cols)[alive]
+    # 展开各存活游程为平铺下标
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cells.flat[np.repeat(starts, counts) + offsets] = 1
+    return cells, meta
+
+def parse_cells(text: str):
+    """解码plaintext (.cells) 图案: 'O'/'*' 为存活，其余为死细胞"""
+    meta = {'name': None, 'rule': None, 'comments': []}
+    lines = []
+    for line in text.splitlines():
+        if line.startswith('!'):
+            if line.startswith('!Name:'):
+                meta['name'] = line[6:].strip()
+            else:
+                meta['comments'].append(line[1:].strip())
+        else:
+            lines.append(line.rstrip())
+    width = max((len(line) for line in lines), default=0)
+    raw = np.frombuffer(''.join(line.ljust(width, '.') for line in lines).encode('ascii'), dtype=np.uint8)
+    cells = ((raw == ord('O')) | (raw == ord('*'))).astype(np.uint8)
+    return cells.reshape(len(lines), width), meta
+
+def load_pattern(path):
+    """按扩展名读取 .rle / .cells 图案文件"""
+    path = Path(path)
+    text = path.read_text(encoding='utf-8', errors='replace')
+    if path.suffix.lower() == '.rle':
+        return parse_rle(text)
+    if path.suffix.lower() == '.cells':
+        return parse_cells(text)
+    raise ValueError(f"不支持的图案格式: {path.suffix}")
+
+def stamp(cells: np.ndarray, pattern: np.ndarray, x: int, y: int, toroidal: bool = True):
+    """将图案的存活细胞写入网格（切片赋值；环形边界下最多拆成四块，非环形时越界部分裁掉）"""
+    height, width = cells.shape
+    ph, pw = pattern.shape
+    if toroidal:
+        if ph > height or pw > width:
+            # 图案大于网格时无法拆成不重叠的切片，按存活细胞坐标取模写入
+            ys, xs = np.nonzero(pattern)
+            cells[(y + ys) % height, (x + xs) % width] = 1
+            return
+        x, y = x % width, y % height
+        row_parts = [(y, min(y + ph, height), 0)]
+        if y + ph > height:
+            row_parts.append((0, y + ph - height, height - y))
+        col_parts = [(x, min(x + pw, width), 0)]
+        if x + pw > width:
+            col_parts.append((0, x + pw - width, width - x))
+    else:
+        row_parts = [(max(y, 0), min(y + ph, height), max(-y, 0))]
+        col_parts = [(max(x, 0), min(x + pw, width), max(-x, 0))]
+    for r0, r1, pr in row_parts:
+        for c0, c1, pc in col_parts:
+            if r1 > r0 and c1 > c0:
+                cells[r0:r1, c0:c1] |= pattern[pr:pr + r1 - r0, pc:pc + c1 - c0] != 0
+
+def place(grid, pattern: np.ndarray, x: int = None, y: int = None):
+    """在网格上放置图案（默认居中），并通知网格其细胞已被外部修改"""
+    x = (grid.width - pattern.shape[1]) // 2 if x is None else x
+    y = (grid.height - pattern.shape[0]) // 2 if y is None else y
+    stamp(grid.cells, pattern, x, y, getattr(grid, 'toroidal', True))
+    if hasattr(grid, 'invalidate'):
+        grid.invalidate()
+
+class PatternCatalog:
+    """磁盘图案库: 首次查询时只读取文件头建立 名称/包围盒 索引，图案本体按需解码并缓存"""
+    def __init__(self, directory: Path = None):
+        self.directory = Path(directory or Config.PATTERN_DIR)
+        self._index = None
+        self._cache = {}
+
+    @staticmethod
+    def _read_header(path: Path):
+        """仅解析名称与尺寸（RLE读到头部行为止）"""
+        name = path.stem
+        with open(path, encoding='utf-8', errors='replace') as f:
+            if path.suffix.lower() == '.rle':
+                for line in f:
+                    line = line.strip()
+                    if line.startswith('#N'):
+                        name = line[2:].strip() or name
+                    elif line.lower().startswith('x'):
+                        match = _RLE_HEADER.match(line)
+                        if match:
+                            return name, int(match.group(1)), int(match.group(2))
+                        break
+            else:
+                rows = [line.rstrip('\n') for line in f]
+                for line in rows:
+                    if line.startswith('!Name:'):
+                        name = line[6:].strip() or name
+                body = [line.rstrip() for line in rows if not line.startswith('!')]
+                return name, max((len(line) for line in body), default=0), len(body)
+        # 缺少RLE头时退化为完整解码
+        cells, _ = load_pattern(path)
+        return name, cells.shape[1], cells.shape[0]
+
+    @property
+    def index(self) -> dict:
+        """名称（小写）-> {name, path, width, height}"""
+        if self._index is None:
+            self._index = {}
+            for path in sorted(self.directory.glob('*')):
+                if path.suffix.lower() not in ('.rle', '.cells'):
+                    continue
+                name, width, height = self._read_header(path)
+                entry = {'name': name, 'path': path, 'width': width, 'height': height}
+                self._index[name.lower()] = entry
+                self._index.setdefault(path.stem.lower(), entry)
+        return self._index
+
+    def names(self) -> list:
+        return sorted({entry['name'] for entry in self.index.values()})
+
+    def find(self, max_width: int = None, max_height: int = None) -> list:
+        """按包围盒筛选可放入给定尺寸的图案名称"""
+        return sorted({entry['name'] for entry in self.index.values()
+                       if (max_width is None or entry['width'] <= max_width)
+                       and (max_height is None or entry['height'] <= max_height)})
+
+    def get(self, name: str) -> np.ndarray:
+        """按名称或文件名获取图案数组（只读缓存）"""
+        entry = self.index.get(name.lower())
+        if entry is None:
+            raise KeyError(f"图案库中不存在: {name}")
+        path = entry['path']
+        if path not in self._cache:
+            cells, _ = load_pattern(path)
+            cells.setflags(write=False)
+            self._cache[path] = cells
+        return self._cache[path]
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.index
@@ -1,5 +1,6 @@
 import numpy as np
 from typing import Tuple
+from core.pattern_io import stamp
 
 class PatternGenerator:
     """所有经典细胞模式的生成器"""
@@ -49,11 +50,7 @@ class PatternGenerator:
     
     @staticmethod
     def _apply_pattern(grid, pattern: np.ndarray, x_offset: int, y_offset: int):
-        """将模式应用到网格（自动处理环形边界）"""
-        h, w = pattern.shape
-        for dy in range(h):
-            for dx in range(w):
-                if pattern[dy, dx]:
-                    y = (y_offset + dy) % grid.height
-                    x = (x_offset + dx) % grid.width
-                    grid.cells[y, x] = 1
\ No newline at end of file
+        """将模式应用到网格（自动处理环形边界，切片赋值），并通知网格其细胞已被外部修改"""
+        stamp(grid.cells, pattern, x_offset, y_offset, toroidal=True)
+        if hasattr(grid, 'invalidate'):
+            grid.invalidate()
@@ -1,5 +1,10 @@
 import numpy as np
 
+def _mark_dirty(grid):
+    """直接写入 cells 后通知网格（分块步进需重算全部块）"""
+    if hasattr(grid, 'invalidate'):
+        grid.invalidate()
+
 class PatternLoader:
     """预设图案加载器[3,9](@ref)"""
     @staticmethod
@@ -11,8 +16,10 @@ class PatternLoader:
             [1, 1, 1]
         ], dtype=np.uint8)
         grid.cells[y_offset:y_offset+3, x_offset:x_offset+3] = pattern
+        _mark_dirty(grid)
     
     @staticmethod  
     def blinker(grid, x_offset=10, y_offset=10):
         """信号灯振荡器[1](@ref)"""
-        grid.cells[y_offset, x_offset:x_offset+3] = 1
\ No newline at end of file
+        grid.cells[y_offset, x_offset:x_offset+3] = 1
+        _mark_dirty(grid)
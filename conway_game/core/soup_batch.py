@@ -0,0 +1,155 @@
+import numpy as np
+from config import Config
+from core.game_rules import apply_rule_table, compile_rule
+from core.cycle_detector import hash_rows
+
+# 汇总表字段
+SOUP_FIELDS = ("soup_id", "status", "lifetime", "final_population", "period")
+
+class SoupBatch:
+    """批量随机汤搜索: K个独立网格堆叠为 (K, H, W) 一次向量化演化，稳定或超时的汤即时退役并补充新汤"""
+    def __init__(self, num_soups: int = None, width: int = None, height: int = None,
+                 density: float = None, toroidal: bool = None, rule: str = None,
+                 max_generations: int = None, max_period: int = None, seed: int = 0):
+        """
+        Args:
+            num_soups: 并行槽位数 K
+            width, height: 单个汤的尺寸
+            density: 初始存活密度
+            toroidal: 是否环形边界
+            rule: 规则串
+            max_generations: 单个汤的最大演化代数（超出记为 timeout）
+            max_period: 可识别的最大周期（每个槽位保留的历史代数）
+            seed: 基础随机种子，第 i 个汤由 (seed, i) 确定，可单独复现
+        """
+        self.num_soups = num_soups or Config.SOUP_BATCH_SIZE
+        self.width = width or Config.SOUP_SIZE
+        self.height = height or Config.SOUP_SIZE
+        self.density = Config.INIT_DENSITY if density is None else density
+        self.toroidal = Config.TOROIDAL_BOUNDARY if toroidal is None else toroidal
+        self.rule_table = compile_rule(rule or Config.RULE)
+        self.max_generations = max_generations or Config.SOUP_MAX_GENERATIONS
+        self.max_period = max_period or Config.SOUP_MAX_PERIOD
+        self.seed = seed
+
+        k, h, w, p = self.num_soups, self.height, self.width, self.max_period
+        self.cells = np.zeros((k, h, w), dtype=np.uint8)
+        self._next = np.zeros_like(self.cells)
+        self._padded = np.zeros((k, h + 2, w + 2), dtype=np.uint8)
+        self._row_sums = np.zeros((k, h + 2, w), dtype=np.uint8)
+        self._counts = np.zeros((k, h, w), dtype=np.uint8)
+
+        # 每槽位的历史环: 哈希、对应年龄与压缩网格（用于碰撞校验）
+        self._nbytes = (h * w + 7) // 8
+        self._hashes = np.zeros((k, p), dtype=np.uint64)
+        self._hash_age = np.full((k, p), -1, dtype=np.int64)
+        self._history = np.zeros((k, p, self._nbytes), dtype=np.uint8)
+
+        self.soup_ids = np.full(k, -1, dtype=np.int64)
+        self.ages = np.zeros(k, dtype=np.int64)
+        self.next_soup_id = 0
+        self.generations_stepped = 0
+
+    def _new_soup(self, slot: int):
+        """向槽位填入下一个随机汤"""
+        soup_id = self.next_soup_id
+        self.next_soup_id += 1
+        rng = np.random.default_rng([self.seed, soup_id])
+        self.cells[slot] = rng.random((self.height, self.width)) < self.density
+        self.soup_ids[slot] = soup_id
+        self.ages[slot] = 0
+        # 记录第0代，使回到初始状态的振荡也能被识别
+        packed = np.packbits(self.cells[slot].reshape(1, -1), axis=1)
+        self._hash_age[slot] = -1
+        self._hashes[slot, 0] = hash_rows(packed)[0]
+        self._hash_age[slot, 0] = 0
+        self._history[slot, 0] = packed[0]
+
+    def soup(self, soup_id: int) -> np.ndarray:
+        """复现指定编号的初始汤"""
+        rng = np.random.default_rng([self.seed, soup_id])
+        return (rng.random((self.height, self.width)) < self.density).astype(np.uint8)
+
+    def step(self):
+        """所有槽位同时演化一代"""
+        padded, cells = self._padded, self.cells
+        padded[:, 1:-1, 1:-1] = cells
+        if self.toroidal:
+            padded[:, 0, 1:-1] = cells[:, -1]
+            padded[:, -1, 1:-1] = cells[:, 0]
+            padded[:, :, 0] = padded[:, :, -2]
+            padded[:, :, -1] = padded[:, :, 1]
+        rows, counts = self._row_sums, self._counts
+        np.add(padded[:, :, :-2], padded[:, :, 1:-1], out=rows)
+        rows += padded[:, :, 2:]
+        np.add(rows[:, :-2], rows[:, 1:-1], out=counts)
+        counts += rows[:, 2:]
+        counts -= cells
+        apply_rule_table(self.rule_table, cells, counts, out=self._next)
+        self.cells, self._next = self._next, self.cells
+        self.ages += 1
+        self.generations_stepped += 1
+
+    def _classify(self):
+        """
+        记录当前状态并判定各槽位是否已结束
+        Returns:
+            (slots, status, period, lifetime, population): 本代结束的槽位及其结果
+        """
+        k = self.num_soups
+        packed = np.packbits(self.cells.reshape(k, -1), axis=1)
+        population = np.count_nonzero(self.cells.reshape(k, -1), axis=1)
+        hashes = hash_rows(packed)
+
+        status = np.full(k, '', dtype=object)
+        period = np.zeros(k, dtype=np.int64)
+        lifetime = self.ages.copy()
+
+        status[population == 0] = 'extinct'
+        period[population == 0] = 1
+
+        # 哈希命中的候选再逐字节校验
+        hits = (self._hashes == hashes[:, None]) & (self._hash_age >= 0)
+        for slot in np.flatnonzero(hits.any(axis=1) & (population > 0)):
+            for j in np.flatnonzero(hits[slot]):
+                if np.array_equal(self._history[slot, j], packed[slot]):
+                    period[slot] = self.ages[slot] - self._hash_age[slot, j]
+                    lifetime[slot] = self._hash_age[slot, j]
+                    status[slot] = 'still' if period[slot] == 1 else 'oscillator'
+                    break
+
+        timeout = (status == '') & (self.ages >= self.max_generations)
+        status[timeout] = 'timeout'
+
+        # 写入历史环
+        col = self.ages % self.max_period
+        slots = np.arange(k)
+        self._hashes[slots, col] = hashes
+        self._hash_age[slots, col] = self.ages
+        self._history[slots, col] = packed
+
+        done = np.flatnonzero(status != '')
+        return done, status[done], period[done], lifetime[done], population[done]
+
+    def run(self, total_soups: int):
+        """
+        处理 total_soups 个汤，按结束顺序逐条产出汇总（流式表格）
+        Yields:
+            row: {soup_id, status, lifetime, final_population, period}
+        """
+        for slot in range(min(self.num_soups, total_soups)):
+            self._new_soup(slot)
+        finished = 0
+        while finished < total_soups:
+            self.step()
+            for slot, status, period, lifetime, population in zip(*self._classify()):
+                if self.soup_ids[slot] < 0:  # 空槽位（汤已全部分配完）
+                    continue
+                yield dict(zip(SOUP_FIELDS, (int(self.soup_ids[slot]), status, int(lifetime),
+                                             int(population), int(period))))
+                finished += 1
+                if self.next_soup_id < total_soups:
+                    self._new_soup(slot)
+                else:
+                    self.soup_ids[slot] = -1
+                    self.cells[slot] = 0
@@ -0,0 +1,96 @@
+import numpy as np
+from config import Config
+from core.game_rules import compile_rule
+
+# 坐标打包: key = y * 2**32 + (x + 偏移)，坐标范围为 int32，键序即 (y, x) 字典序
+_BIAS = 1 << 31
+_ROW = 1 << 32
+# 8邻域偏移在打包空间中的增量（坐标不越界时加法与打包可交换）
+_NEIGHBOR_OFFSETS = np.array([dy * _ROW + dx for dy in (-1, 0, 1) for dx in (-1, 0, 1)
+                              if dy or dx], dtype=np.int64)
+
+def pack_coords(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """将 (x, y) 坐标打包为int64键"""
+    return np.asarray(y, dtype=np.int64) * _ROW + (np.asarray(x, dtype=np.int64) + _BIAS)
+
+def unpack_coords(keys: np.ndarray):
+    """由int64键解出 (x, y) 坐标"""
+    return (keys & (_ROW - 1)) - _BIAS, keys >> 32
+
+class SparsePlaneGrid:
+    """无界稀疏平面: 仅存储存活细胞的有序打包坐标，开销随种群而非包围盒增长"""
+    def __init__(self, width: int = None, height: int = None, rule: str = None):
+        self.rule = rule or Config.RULE
+        self.rule_table = compile_rule(self.rule)
+        if self.rule_table[0, 0]:
+            raise ValueError(f"无界平面不支持 B0 规则: {self.rule}")
+        self.keys = np.empty(0, dtype=np.int64)  # 有序、无重复
+        self.generation = 0
+        # 导出稠密数组的视口 (x, y, 宽, 高)
+        self.viewport = (0, 0, width or Config.GRID_WIDTH, height or Config.GRID_HEIGHT)
+
+    def set_cells(self, cells: np.ndarray, x0: int = 0, y0: int = 0):
+        """由稠密0/1数组导入存活细胞（并将视口设为该数组区域）"""
+        ys, xs = np.nonzero(cells)
+        self.keys = np.sort(pack_coords(xs + x0, ys + y0))
+        self.viewport = (x0, y0, cells.shape[1], cells.shape[0])
+
+    @classmethod
+    def from_grid(cls, grid) -> "SparsePlaneGrid":
+        """由 ToroidalGrid 导入（之后不再环绕）"""
+        plane = cls(grid.width, grid.height, getattr(grid, 'rule', None))
+        plane.set_cells(grid.cells)
+        plane.generation = getattr(grid, 'generation', 0)
+        return plane
+
+    @property
+    def population(self) -> int:
+        return len(self.keys)
+
+    def step(self):
+        """演化一代: 展开邻居偏移后排序去重计数"""
+        keys = self.keys
+        if len(keys):
+            candidates, counts = np.unique((keys[:, None] + _NEIGHBOR_OFFSETS).ravel(),
+                                           return_counts=True)
+            # 计数为2的候选需判断当前是否存活（keys有序，二分查找）
+            idx = np.minimum(np.searchsorted(keys, candidates), len(keys) - 1)
+            alive = keys[idx] == candidates
+            new = candidates[self.rule_table[alive.view(np.uint8), counts] != 0]
+            if self.rule_table[1, 0]:
+                # S0: 无任何邻居的孤立存活细胞不在候选中，需单独保留
+                isolated = keys[~np.isin(keys, candidates, assume_unique=True)]
+                new = np.union1d(new, isolated)
+            self.keys = new
+        self.generation += 1
+
+    def bounding_box(self):
+        """存活细胞的包围盒 (x, y, 宽, 高)，无存活细胞时返回 None"""
+        if not len(self.keys):
+            return None
+        xs, ys = unpack_coords(self.keys)
+        x0, y0 = int(xs.min()), int(ys.min())
+        return x0, y0, int(xs.max()) - x0 + 1, int(ys.max()) - y0 + 1
+
+    def to_dense(self, x0: int, y0: int, width: int, height: int) -> np.ndarray:
+        """导出指定视口的稠密uint8数组"""
+        out = np.zeros((height, width), dtype=np.uint8)
+        # keys按行有序，先二分截取视口行范围
+        lo, hi = np.searchsorted(self.keys, [pack_coords(-_BIAS, y0), pack_coords(-_BIAS, y0 + height)])
+        xs, ys = unpack_coords(self.keys[lo:hi])
+        mask = (xs >= x0) & (xs < x0 + width)
+        out[ys[mask] - y0, xs[mask] - x0] = 1
+        return out
+
+    @property
+    def cells(self) -> np.ndarray:
+        """视口内的稠密视图，供现有可视化使用"""
+        return self.to_dense(*self.viewport)
+
+    @property
+    def width(self) -> int:
+        return self.viewport[2]
+
+    @property
+    def height(self) -> int:
+        return self.viewport[3]
@@ -0,0 +1,118 @@
+import numpy as np
+from config import Config
+
+# 每代记录的字段
+STATS_FIELDS = ("generation", "population", "births", "deaths")
+
+class StatsRing:
+    """预分配的定长环形缓冲区: 每行一代，写满后覆盖最旧记录"""
+    def __init__(self, capacity: int = None, fields: tuple = STATS_FIELDS):
+        self.capacity = capacity or Config.STATS_HISTORY_SIZE
+        self.fields = fields
+        self._data = np.zeros((self.capacity, len(fields)), dtype=np.int64)
+        self.total = 0  # 累计写入条数
+
+    def record(self, *values):
+        self._data[self.total % self.capacity] = values
+        self.total += 1
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def copy(self) -> "StatsRing":
+        ring = StatsRing(self.capacity, self.fields)
+        ring._data[...] = self._data
+        ring.total = self.total
+        return ring
+
+    def snapshot(self) -> np.ndarray:
+        """按时间顺序返回 (n, 字段数) 副本"""
+        n = len(self)
+        if self.total <= self.capacity:
+            return self._data[:n].copy()
+        head = self.total % self.capacity
+        return np.concatenate((self._data[head:], self._data[:head]))
+
+    def column(self, name: str) -> np.ndarray:
+        return self.snapshot()[:, self.fields.index(name)]
+
+    def latest(self) -> dict:
+        if not self.total:
+            return {}
+        return dict(zip(self.fields, self._data[(self.total - 1) % self.capacity].tolist()))
+
+class StepStats:
+    """
+    步进内统计: 出生/死亡/存活数写入环形缓冲区，并维护按代衰减的逐格活跃度热图
+    热图采用惰性衰减: 第 g 代的变化按 decay^-g 累加，读取时再乘 decay^g，
+    因此每代只需一次乘加（变化掩码 × 当前权重），无需整网格衰减（分块步进时未变化的块完全不触碰）
+    """
+    _RESCALE_LIMIT = 1e6  # 累加权重超过该值时整体归一化一次，避免 float32 溢出
+
+    def __init__(self, shape: tuple, capacity: int = None, decay: float = None,
+                 heatmap: bool = False):
+        self.shape = shape
+        self.history = StatsRing(capacity)
+        self.decay = Config.STATS_HEAT_DECAY if decay is None else decay
+        if not 0 < self.decay < 1:
+            raise ValueError(f"STATS_HEAT_DECAY 必须在 (0, 1) 内: {self.decay}")
+        self.heatmap_enabled = False
+        self._weight = 1.0  # 当前代变化格的累加权重 decay^-g（相对上次归一化）
+        if heatmap:
+            self.enable_heatmap()
+
+    def enable_heatmap(self):
+        """开始维护热图（每代增加一次整网格乘加，仅在有统计图显示时开启）"""
+        if self.heatmap_enabled:
+            return
+        self._heat = np.zeros(self.shape, dtype=np.float32)
+        self._scratch = np.zeros(self.shape, dtype=np.float32)
+        self._weight = 1.0
+        self.heatmap_enabled = True
+
+    def begin_generation(self):
+        """进入新一代: 增大累加权重，必要时归一化"""
+        if not self.heatmap_enabled:
+            return
+        self._weight /= self.decay
+        if self._weight > self._RESCALE_LIMIT:
+            self._heat /= self._weight
+            self._weight = 1.0
+
+    def add_activity(self, changed: np.ndarray, rows: slice = slice(None), cols: slice = slice(None)):
+        """累加变化格（changed 为 0/1 掩码，可只对应网格的一个矩形区域）"""
+        if not self.heatmap_enabled:
+            return
+        # 稠密乘加比 where= 掩码累加快一个数量级
+        scratch = self._scratch[rows, cols]
+        np.multiply(changed, np.float32(self._weight), out=scratch)
+        region = self._heat[rows, cols]
+        region += scratch
+
+    def record(self, generation: int, population: int, births: int, deaths: int):
+        self.history.record(generation, population, births, deaths)
+
+    @property
+    def heatmap(self) -> np.ndarray:
+        """活跃度热图: 每格 sum(decay^(当前代-变化代))，刚变化的格约为1（未启用时返回 None）"""
+        if not self.heatmap_enabled:
+            return None
+        return self._heat / np.float32(self._weight)
+
+    def snapshot(self) -> "StepStats":
+        """
+        拷贝当前统计供其他线程读取（须在步进线程中两代之间调用）:
+        环形缓冲区整体拷贝，热图按当前权重归一化后存为独立数组
+        """
+        copy = StepStats.__new__(StepStats)
+        copy.shape, copy.decay = self.shape, self.decay
+        copy.history = self.history.copy()
+        copy.heatmap_enabled = self.heatmap_enabled
+        copy._weight = 1.0
+        if self.heatmap_enabled:
+            copy._heat = self.heatmap
+        return copy
+
+    @property
+    def population(self) -> int:
+        return self.history.latest().get('population')
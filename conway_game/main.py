@@ -1,9 +1,15 @@
 import argparse
-import numpy as np
 from core.grid_system import ToroidalGrid
-from core.game_rules import conway_rule
+from core.bitboard import BitboardGrid
+from core.hashlife import HashLifeEngine
+from core.sparse_plane import SparsePlaneGrid
+from core.parallel_grid import ParallelToroidalGrid
+from core.cycle_detector import CycleDetector
 from core.pattern_loader import PatternLoader
+from core.pattern_io import PatternCatalog, load_pattern, place
 from visualization.matplotlib_engine import VisualizationEngine
+from runner import SimulationRunner
+from utils.logger import logger
 from config import Config
 
 def simulate():
@@ -12,27 +18,45 @@ def simulate():
     
     # 初始化模式
     parser = argparse.ArgumentParser(description='康威生命游戏模拟器')
-    parser.add_argument('-p', '--pattern', choices=['random', 'glider'], default='random')
+    parser.add_argument('-p', '--pattern', default='random',
+                        help='random、glider、图案库中的名称，或 .rle/.cells 文件路径')
+    parser.add_argument('-m', '--mode', choices=['sync', 'decoupled', 'headless'], default=Config.RUN_MODE,
+                        help='sync 逐代渲染; decoupled 后台全速演化+限帧渲染; headless 无界面批处理')
     args = parser.parse_args()
     
-    if args.pattern == 'glider':
+    if args.pattern == 'random':
+        grid.random_init()
+    elif args.pattern == 'glider':
         PatternLoader.glider(grid, 10, 10)
+    elif args.pattern.lower().endswith(('.rle', '.cells')):
+        place(grid, load_pattern(args.pattern)[0])
     else:
-        grid.random_init()
+        place(grid, PatternCatalog().get(args.pattern))
+    
+    if Config.GRID_BACKEND == "bitboard":
+        if BitboardGrid.supports_rule(grid.rule):
+            grid = BitboardGrid.from_grid(grid)
+        else:
+            logger.warning(f"位压缩后端仅支持 B3/S23，规则 {grid.rule} 改用稠密后端")
+    elif Config.GRID_BACKEND == "hashlife":
+        grid = HashLifeEngine.from_grid(grid)
+    elif Config.GRID_BACKEND == "sparse":
+        grid = SparsePlaneGrid.from_grid(grid)
+    elif Config.GRID_BACKEND == "parallel":
+        grid = ParallelToroidalGrid.from_grid(grid)
     
-    visualizer = VisualizationEngine()
+    visualizer = None if args.mode == 'headless' else VisualizationEngine()
+    detector = CycleDetector() if Config.CYCLE_DETECTION else None
     
     try:
-        for gen in range(1000):
-            new_state = np.zeros_like(grid.cells)
-            for y in range(grid.height):
-                for x in range(grid.width):
-                    neighbors = grid.get_neighbors_count(x, y)
-                    new_state[y, x] = conway_rule(grid.cells[y, x], neighbors)
-            grid.cells[:, :] = new_state
-            visualizer.update_frame(grid, gen)
+        SimulationRunner(grid, args.mode, visualizer, detector).run()
     except KeyboardInterrupt:
         print("\nSimulation terminated by user")
+    finally:
+        if visualizer:
+            visualizer.finalize()
+        if isinstance(grid, ParallelToroidalGrid):
+            grid.close()
 
 if __name__ == "__main__":
     simulate()
\ No newline at end of file
@@ -0,0 +1,134 @@
+import threading
+import time
+import numpy as np
+from config import Config
+from utils.logger import logger
+
+class Snapshot:
+    """渲染用快照（仅含可视化所需的 cells、代数与网格的步进内统计）"""
+    def __init__(self, cells: np.ndarray, generation: int, stats=None):
+        self.cells = cells
+        self.generation = generation
+        self.stats = stats
+
+class SimulationRunner:
+    """模拟主循环: sync 逐代渲染; decoupled 演化在后台线程全速运行，渲染端每帧取最新快照并丢弃中间代; headless 无渲染"""
+    def __init__(self, grid, mode: str = None, visualizer=None, detector=None, max_generations: int = None):
+        """
+        Args:
+            grid: 任意提供 step()/cells/generation 的网格后端
+            mode: "sync" / "decoupled" / "headless"
+            visualizer: 渲染器（提供 update_frame），headless 模式下忽略
+            detector: 周期检测器，检测到周期时按 Config.CYCLE_ACTION 处理
+            max_generations: 演化终止代数
+        """
+        self.mode = mode or Config.RUN_MODE
+        if self.mode not in ("sync", "decoupled", "headless"):
+            raise ValueError(f"未知的运行模式: {self.mode}")
+        if self.mode != "headless" and visualizer is None:
+            raise ValueError(f"{self.mode} 模式需要提供渲染器")
+        self.grid = grid
+        if self.mode != "headless" and hasattr(visualizer, 'attach'):
+            visualizer.attach(grid)
+        self.max_generations = max_generations or Config.MAX_GENERATIONS
+        self.visualizer = visualizer
+        self.detector = detector
+        self.report = None
+        self.rendered_frames = 0
+        self._stop = threading.Event()
+        self._want_frame = threading.Event()
+        self._frame_ready = threading.Event()
+        self._frame = None
+        self._error = None
+
+    def _advance(self) -> bool:
+        """演化一代并做周期检测，返回是否继续"""
+        self.grid.step()
+        if self.detector:
+            report = self.detector.observe(self.grid)
+            if report:
+                self.report = report
+                logger.info(f"第 {report.start_generation} 代起进入 {report.kind} 状态 "
+                            f"(周期 {report.period}，于第 {report.detected_at} 代检测到)")
+                if Config.CYCLE_ACTION == "stop":
+                    return False
+                if Config.CYCLE_ACTION == "fast_forward":
+                    self.detector.fast_forward(self.grid, self.max_generations)
+        return not self._stop.is_set()
+
+    def _snapshot(self) -> Snapshot:
+        """在演化线程两代之间拷贝细胞与统计，渲染端读取时不受后续步进影响"""
+        stats = getattr(self.grid, 'stats', None)
+        return Snapshot(np.array(self.grid.cells), self.grid.generation,
+                        None if stats is None else stats.snapshot())
+
+    def _simulate(self):
+        """后台演化线程: 仅在渲染端请求时拷贝快照"""
+        try:
+            while self.grid.generation < self.max_generations and self._advance():
+                if self._want_frame.is_set():
+                    self._want_frame.clear()
+                    self._frame = self._snapshot()
+                    self._frame_ready.set()
+        except Exception as e:  # 错误在主线程结束时抛出
+            self._error = e
+            logger.error(f"演化线程异常: {str(e)}")
+        finally:
+            self._frame_ready.set()
+
+    def run(self) -> dict:
+        """运行至终止代数（或检测到周期），返回吞吐统计"""
+        if self.detector:
+            self.detector.observe(self.grid)
+        start_generation = self.grid.generation
+        start = time.perf_counter()
+        if self.mode == "headless":
+            # 无界面模式: 直接在当前线程全速演化
+            while self.grid.generation < self.max_generations and self._advance():
+                pass
+        elif self.mode == "sync":
+            while self.grid.generation < self.max_generations and self._advance():
+                self.visualizer.update_frame(self.grid, self.grid.generation)
+                self.rendered_frames += 1
+        else:
+            self._render_loop()
+        elapsed = time.perf_counter() - start
+        if self._error is not None:
+            raise RuntimeError("演化线程异常") from self._error
+
+        generations = self.grid.generation - start_generation
+        stats = {
+            'generations': generations,
+            'seconds': elapsed,
+            'generations_per_second': generations / elapsed if elapsed > 0 else float('inf'),
+            'rendered_frames': self.rendered_frames,
+            # 无界面模式不渲染，也就不存在丢帧
+            'dropped_frames': 0 if self.mode == "headless" else max(generations - self.rendered_frames, 0),
+        }
+        logger.info(f"共演化 {generations} 代，用时 {elapsed:.2f}s ({stats['generations_per_second']:.1f} 代/秒)，"
+                    f"渲染 {self.rendered_frames} 帧，丢弃 {stats['dropped_frames']} 帧")
+        return stats
+
+    def _render_loop(self):
+        """主线程渲染循环: 帧率由可视化端 update_frame 的 FPS 节流决定"""
+        worker = threading.Thread(target=self._simulate, name="LifeStepper", daemon=True)
+        worker.start()
+        try:
+            while worker.is_alive():
+                self._frame_ready.clear()
+                self._want_frame.set()
+                # 演化线程可能在请求前已结束，带超时等待以免永久阻塞
+                while not self._frame_ready.wait(0.1) and worker.is_alive():
+                    pass
+                frame, self._frame = self._frame, None
+                if frame is not None:
+                    self.visualizer.update_frame(frame, frame.generation)
+                    self.rendered_frames += 1
+        except KeyboardInterrupt:
+            self._stop.set()
+            raise
+        finally:
+            worker.join()
+        # 补绘终态
+        self.visualizer.update_frame(self._snapshot(), self.grid.generation)
+        self.rendered_frames += 1
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 项目模块以扁平方式导入（from config import Config），测试时将项目目录加入搜索路径
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
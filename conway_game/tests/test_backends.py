@@ -0,0 +1,146 @@
+"""
+网格后端一致性测试
+以稠密 ToroidalGrid 为参照，在随机汤上逐代比对各后端的演化结果
+"""
+
+import numpy as np
+import pytest
+from core.grid_system import ToroidalGrid
+from core.bitboard import BitboardGrid
+from core.sparse_plane import SparsePlaneGrid
+from core.hashlife import HashLifeEngine
+from core.parallel_grid import ParallelToroidalGrid
+
+def random_soup(height: int, width: int, density: float = 0.35, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (rng.random((height, width)) < density).astype(np.uint8)
+
+def dense_reference(cells: np.ndarray, toroidal: bool, rule: str = "B3/S23") -> ToroidalGrid:
+    height, width = cells.shape
+    grid = ToroidalGrid(width, height, toroidal, active_tiles=False, rule=rule)
+    grid.cells = cells.copy()
+    return grid
+
+@pytest.mark.parametrize("toroidal", [True, False])
+@pytest.mark.parametrize("shape", [(48, 64), (37, 100)])  # 含宽度非64倍数的情形
+def test_bitboard_matches_dense(shape, toroidal):
+    cells = random_soup(*shape, seed=1)
+    reference = dense_reference(cells, toroidal)
+    bitboard = BitboardGrid.from_dense(cells, toroidal=toroidal)
+    for _ in range(30):
+        reference.step()
+        bitboard.step()
+        np.testing.assert_array_equal(bitboard.cells, reference.cells)
+    assert bitboard.population() == np.count_nonzero(reference.cells)
+
+def test_bitboard_rejects_other_rules():
+    assert not BitboardGrid.supports_rule("B36/S23")
+    with pytest.raises(ValueError):
+        BitboardGrid(64, 64, rule="B36/S23")
+
+@pytest.mark.parametrize("toroidal", [True, False])
+@pytest.mark.parametrize("rule", ["B3/S23", "B36/S23"])
+def test_active_tiles_match_dense(toroidal, rule):
+    # 稀疏汤使多数块在若干代后静止，覆盖分块重算路径
+    cells = np.zeros((96, 96), dtype=np.uint8)
+    cells[20:44, 30:54] = random_soup(24, 24, seed=2)
+    reference = dense_reference(cells, toroidal, rule)
+    tiled = ToroidalGrid(96, 96, toroidal, active_tiles=True, tile_size=8, rule=rule)
+    tiled.cells = cells.copy()
+    tiled.invalidate()
+    for _ in range(60):
+        reference.step()
+        tiled.step()
+        np.testing.assert_array_equal(tiled.cells, reference.cells)
+    assert tiled.active_tile_count < (96 // 8) ** 2
+
+@pytest.mark.parametrize("active_tiles", [False, True])
+def test_step_stats_match_cell_changes(active_tiles):
+    cells = random_soup(64, 64, seed=3)
+    grid = ToroidalGrid(64, 64, True, active_tiles=active_tiles, tile_size=8)
+    grid.cells = cells.copy()
+    grid.invalidate()
+    stats = grid.enable_stats()
+    for _ in range(20):
+        previous = grid.cells.copy()
+        grid.step()
+        latest = stats.history.latest()
+        assert latest['generation'] == grid.generation
+        assert latest['population'] == np.count_nonzero(grid.cells)
+        assert latest['births'] == np.count_nonzero(grid.cells > previous)
+        assert latest['deaths'] == np.count_nonzero(grid.cells < previous)
+
+def test_stats_disabled_by_default():
+    grid = ToroidalGrid(32, 32, True)
+    grid.step()
+    assert grid.stats is None
+
+@pytest.mark.parametrize("toroidal", [True, False])
+def test_parallel_matches_dense(toroidal):
+    cells = random_soup(50, 40, seed=4)
+    reference = dense_reference(cells, toroidal)
+    with ParallelToroidalGrid(40, 50, toroidal, num_workers=3) as parallel:
+        parallel.cells[...] = cells
+        for generations in (1, 2, 5):
+            parallel.run(generations)
+            for _ in range(generations):
+                reference.step()
+            np.testing.assert_array_equal(parallel.cells, reference.cells)
+        assert parallel.generation == reference.generation
+    np.testing.assert_array_equal(parallel.cells, reference.cells)  # 关闭后状态仍可读取
+
+def planar_soup(margin: int, seed: int) -> np.ndarray:
+    """中心为随机汤、四周留白的稠密网格：演化 margin 代内不会触及边界，与无界平面等价"""
+    cells = np.zeros((16 + 2 * margin, 16 + 2 * margin), dtype=np.uint8)
+    cells[margin:margin + 16, margin:margin + 16] = random_soup(16, 16, seed=seed)
+    return cells
+
+@pytest.mark.parametrize("rule", ["B3/S23", "B36/S23"])
+def test_sparse_plane_matches_dense(rule):
+    cells = planar_soup(40, seed=5)
+    reference = dense_reference(cells, toroidal=False, rule=rule)
+    plane = SparsePlaneGrid(rule=rule)
+    plane.set_cells(cells)
+    for _ in range(40):
+        reference.step()
+        plane.step()
+        np.testing.assert_array_equal(plane.cells, reference.cells)
+    assert plane.population == np.count_nonzero(reference.cells)
+
+@pytest.mark.parametrize("rule", ["B3/S23", "B36/S23"])
+def test_hashlife_single_steps_match_dense(rule):
+    cells = planar_soup(40, seed=6)
+    reference = dense_reference(cells, toroidal=False, rule=rule)
+    engine = HashLifeEngine(step_exponent=0, rule=rule)
+    engine.set_cells(cells)
+    for _ in range(40):
+        reference.step()
+        engine.step()
+        np.testing.assert_array_equal(engine.cells, reference.cells)
+    assert engine.generation == 40
+
+def test_hashlife_jumps_match_dense():
+    cells = planar_soup(64, seed=7)
+    reference = dense_reference(cells, toroidal=False)
+    engine = HashLifeEngine()
+    engine.set_cells(cells)
+    total = 0
+    for generations in (1, 6, 16, 37):
+        engine.advance(generations)
+        for _ in range(generations):
+            reference.step()
+        total += generations
+        np.testing.assert_array_equal(engine.cells, reference.cells)
+    assert engine.generation == total
+
+def test_hashlife_gc_preserves_results():
+    cells = planar_soup(64, seed=8)
+    reference = HashLifeEngine()
+    reference.set_cells(cells)
+    collected = HashLifeEngine(max_nodes=500)
+    collected.set_cells(cells)
+    for _ in range(20):
+        reference.advance(3)
+        collected.advance(3)
+        np.testing.assert_array_equal(collected.cells, reference.cells)
+    assert collected.gc_count > 0
@@ -0,0 +1,71 @@
+"""
+图案读写测试
+将图案库中的图案重新编码为 RLE / plaintext 后再次解码，结果应与原图案一致
+"""
+
+import numpy as np
+import pytest
+from config import Config
+from core.pattern_io import PatternCatalog, load_pattern, parse_cells, parse_rle
+
+PATTERN_FILES = sorted(p for p in Config.PATTERN_DIR.glob('*') if p.suffix.lower() in ('.rle', '.cells'))
+
+def encode_rle(cells: np.ndarray, name: str = None) -> str:
+    """逐行游程编码（仅供测试往返使用）"""
+    rows = []
+    for row in cells:
+        runs, x = [], 0
+        while x < len(row):
+            end = x
+            while end < len(row) and row[end] == row[x]:
+                end += 1
+            runs.append(f"{end - x if end - x > 1 else ''}{'o' if row[x] else 'b'}")
+            x = end
+        rows.append(''.join(runs))
+    header = f"x = {cells.shape[1]}, y = {cells.shape[0]}, rule = B3/S23"
+    lines = ([f"#N {name}"] if name else []) + [header, '$'.join(rows) + '!']
+    return '\n'.join(lines)
+
+def encode_cells(cells: np.ndarray, name: str = None) -> str:
+    lines = [f"!Name: {name}"] if name else []
+    lines += [''.join('O' if v else '.' for v in row) for row in cells]
+    return '\n'.join(lines)
+
+def test_bundled_patterns_present():
+    assert PATTERN_FILES
+
+@pytest.mark.parametrize("path", PATTERN_FILES, ids=lambda p: p.name)
+def test_round_trip(path):
+    cells, meta = load_pattern(path)
+    assert cells.dtype == np.uint8 and cells.any()
+    decoded, decoded_meta = parse_rle(encode_rle(cells, meta['name']))
+    np.testing.assert_array_equal(decoded, cells)
+    assert decoded_meta['name'] == meta['name']
+    decoded, decoded_meta = parse_cells(encode_cells(cells, meta['name']))
+    np.testing.assert_array_equal(decoded, cells)
+    assert decoded_meta['name'] == meta['name']
+
+def test_glider_rle():
+    cells, meta = parse_rle("#N Glider\nx = 3, y = 3, rule = B3/S23\nbob$2bo$3o!")
+    np.testing.assert_array_equal(cells, [[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+    assert meta['name'] == 'Glider' and meta['rule'] == 'B3/S23'
+
+def test_rle_multi_digit_runs_and_blank_rows():
+    cells, _ = parse_rle("x = 12, y = 4\n12o2$b10ob!")
+    assert cells.shape == (4, 12)
+    assert cells[0].all() and not cells[1].any()
+    np.testing.assert_array_equal(cells[2], [0] + [1] * 10 + [0])
+    assert not cells[3].any()
+
+@pytest.mark.parametrize("text", ["#N Wide\nx = 2, y = 3\nbo$2bo$3o!", "#N Tall\nx = 3, y = 2\nbo$2bo$3o!"])
+def test_rle_exceeding_header_raises(text):
+    with pytest.raises(ValueError, match="Wide|Tall"):
+        parse_rle(text)
+
+def test_catalog_matches_files():
+    catalog = PatternCatalog()
+    for path in PATTERN_FILES:
+        cells, _ = load_pattern(path)
+        np.testing.assert_array_equal(catalog.get(path.stem), cells)
+        entry = catalog.index[path.stem.lower()]
+        assert (entry['height'], entry['width']) == cells.shape
@@ -9,8 +9,8 @@ class GIFExporter:
         self.dpi = fig.get_dpi()
         self.width, self.height = map(int, fig.get_size_inches() * self.dpi)
         
-    def capture_frame(self):
-        """捕获当前帧"""
+    def capture_frame(self, grid=None):
+        """捕获当前帧（截取画布，grid 参数仅为与流式导出器接口一致）"""
         # 使用renderer捕获RGBA缓冲区
         canvas = self.fig.canvas
         canvas.draw()
@@ -2,6 +2,7 @@ import matplotlib.pyplot as plt
 from config import Config
 import numpy as np
 from visualization.gif_exporter import GIFExporter
+from visualization.stream_exporter import StreamingExporter
 from visualization.stats_visualizer import StatsVisualizer
 from utils.logger import logger
 
@@ -20,22 +21,28 @@ class VisualizationEngine:
         )
         plt.axis('off')
         
-        self.gif_exporter = GIFExporter(self.fig)
+        self.gif_exporter = StreamingExporter() if Config.GIF_STREAMING else GIFExporter(self.fig)
         self.stats_visualizer = StatsVisualizer() if Config.STATS_ENABLED else None
     
     
+    def attach(self, grid):
+        """运行开始前连接网格（统计图启用时才让网格开始收集步进内统计）"""
+        if self.stats_visualizer and hasattr(grid, 'enable_stats'):
+            stats = grid.enable_stats()
+            if stats is not None:
+                self.stats_visualizer.attach(stats)
+    
     def update_frame(self, grid, generation: int):
         """更新动画帧"""
         self.img.set_data(grid.cells)
         self.ax.set_title(f'Generation: {generation}')
         plt.pause(1/Config.FPS)
         # 捕获GIF帧
-        self.gif_exporter.capture_frame()
+        self.gif_exporter.capture_frame(grid)
         
         # 更新统计数据
         if self.stats_visualizer:
-            current_population = np.sum(grid.cells)
-            self.stats_visualizer.update_stats(current_population)
+            self.stats_visualizer.update_stats(grid, generation)
             
         
     def finalize(self):
@@ -1,37 +1,87 @@
 import matplotlib.pyplot as plt
-from collections import deque
+import numpy as np
 from config import Config
+from core.step_stats import StatsRing
 
 class StatsVisualizer:
+    """统计图表: 数据来自预分配的环形缓冲区，图形与曲线只创建一次，之后仅替换曲线数据增量重绘"""
     def __init__(self):
-        self.stats_history = {
-            'population': deque(maxlen=Config.STATS_HISTORY_SIZE),
-            'change_rate': deque(maxlen=Config.STATS_HISTORY_SIZE)
-        }
-        
-    def update_stats(self, current_population: int):
-        """更新统计数据"""
-        if len(self.stats_history['population']) > 0:
-            prev = self.stats_history['population'][-1]
-            change_rate = (current_population - prev) / (prev + 1e-6)  # 防止除零
-            self.stats_history['change_rate'].append(change_rate)
-            
-        self.stats_history['population'].append(current_population)
-    
-    def show_stats(self):
-        """显示统计图表"""
-        fig, axs = plt.subplots(2, 1, figsize=(10, 6))
-        
+        self.history = StatsRing()  # 网格不提供步进内统计时的回退记录（仅存活数）
+        self.source = None          # 网格的 StepStats
+        self.fig = None
+        self._lines = {}
+        self._heat_image = None
+        self._frames = 0
+
+    def attach(self, stats):
+        """连接网格的步进内统计，需要显示热图时才让网格开始维护"""
+        if Config.STATS_HEATMAP:
+            stats.enable_heatmap()
+        self.source = stats
+
+    def update_stats(self, grid, generation: int):
+        """更新统计数据（优先读取网格步进时产出的统计，每 STATS_REFRESH_EVERY 帧重绘一次）"""
+        stats = getattr(grid, 'stats', None)
+        if stats is not None:
+            self.source = stats
+        else:
+            self.history.record(generation, int(np.count_nonzero(grid.cells)), 0, 0)
+        self._frames += 1
+        if self._frames % Config.STATS_REFRESH_EVERY == 0:
+            self.refresh()
+
+    def _create_figure(self):
+        """创建图形与空曲线"""
+        heatmap = self.source is not None and self.source.heatmap_enabled
+        panels = 1 if self.source is None else 3 if heatmap else 2
+        self.fig, axs = plt.subplots(panels, 1, figsize=(10, 3 * panels + 1), squeeze=False)
+        axs = axs[:, 0]
+
         # 人口数量图表
-        axs[0].plot(self.stats_history['population'], 'b-')
+        self._lines['population'], = axs[0].plot([], [], 'b-')
         axs[0].set_title('Cell Population Over Time')
         axs[0].set_ylabel('Living Cells')
-        
-        # 变化率图表
-        axs[1].plot(self.stats_history['change_rate'], 'r--')
-        axs[1].set_title('Population Change Rate')
-        axs[1].set_ylabel('Rate')
-        axs[1].set_xlabel('Generation')
-        
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        axs[0 if self.source is None else 1].set_xlabel('Generation')
+
+        if self.source is not None:
+            # 出生/死亡图表
+            self._lines['births'], = axs[1].plot([], [], 'g-', label='Births')
+            self._lines['deaths'], = axs[1].plot([], [], 'r--', label='Deaths')
+            axs[1].set_title('Births / Deaths per Generation')
+            axs[1].set_ylabel('Cells')
+            axs[1].legend(loc='upper right')
+
+        if heatmap:
+            # 活跃度热图
+            self._heat_image = axs[2].imshow(self.source.heatmap, cmap='hot', vmin=0, vmax=1)
+            axs[2].set_title('Activity Heatmap')
+            axs[2].axis('off')
+            self.fig.colorbar(self._heat_image, ax=axs[2])
+        self._axes = axs[:2] if self.source is not None else axs
+        self.fig.tight_layout()
+
+    def refresh(self):
+        """以环形缓冲区的当前内容替换曲线数据"""
+        ring = self.source.history if self.source is not None else self.history
+        if not len(ring):
+            return
+        if self.fig is None:
+            self._create_figure()
+        data = ring.snapshot()
+        x = data[:, 0]
+        for name, line in self._lines.items():
+            line.set_data(x, data[:, ring.fields.index(name)])
+        for ax in self._axes:
+            ax.relim()
+            ax.autoscale_view()
+        if self._heat_image is not None:
+            heat = self.source.heatmap
+            self._heat_image.set_data(heat)
+            self._heat_image.set_clim(0, max(float(heat.max()), 1.0))
+        self.fig.canvas.draw_idle()
+
+    def show_stats(self):
+        """显示统计图表"""
+        self.refresh()
+        if self.fig is not None:
+            plt.show()
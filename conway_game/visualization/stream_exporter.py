@@ -0,0 +1,148 @@
+import io
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+from pathlib import Path
+import numpy as np
+from PIL import Image
+from matplotlib.colors import to_rgb
+from config import Config
+from utils.logger import logger
+
+def _palette() -> np.ndarray:
+    """双色调色板: 索引0为死细胞颜色，索引1为活细胞颜色"""
+    return np.array([to_rgb(Config.COLOR_DEAD), to_rgb(Config.COLOR_ALIVE)]) * 255 + 0.5
+
+def upscale(cells: np.ndarray, scale: int) -> np.ndarray:
+    """最近邻放大（广播视图后一次拷贝）"""
+    h, w = cells.shape
+    return np.broadcast_to(cells[:, None, :, None], (h, scale, w, scale)).reshape(h * scale, w * scale)
+
+class StreamingGIFWriter:
+    """逐帧追加写入GIF: 文件头与全局调色板只写一次，各帧仅编码为LZW图像块"""
+    def __init__(self, path: Path, fps: int):
+        self.path = Path(path)
+        self.delay = max(1, round(100 / fps))  # GIF帧延时单位为1/100秒
+        self._file = None
+
+    def _start(self, height: int, width: int):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'wb')
+        # 逻辑屏幕描述符: 含2色全局调色板（标志位 0x80 全局表 | 0x70 色深 | 0 表示2项）
+        self._file.write(b'GIF89a' + struct.pack('<HHBBB', width, height, 0xF0, 0, 0))
+        self._file.write(_palette().astype(np.uint8).tobytes())
+        # NETSCAPE2.0 扩展: 无限循环
+        self._file.write(b'\x21\xFF\x0BNETSCAPE2.0\x03\x01\x00\x00\x00')
+
+    @staticmethod
+    def _image_block(indices: np.ndarray) -> bytes:
+        """借助PIL编码单帧GIF，截取图像描述符至结尾符之前的部分"""
+        buffer = io.BytesIO()
+        image = Image.fromarray(indices, mode='P')
+        image.putpalette([0, 0, 0, 255, 255, 255])
+        image.save(buffer, format='GIF', optimize=False)
+        data = buffer.getvalue()
+        pos = 13
+        if data[10] & 0x80:
+            pos += 3 << ((data[10] & 0x07) + 1)
+        # 跳过扩展块，定位图像描述符 0x2C
+        while data[pos] == 0x21:
+            pos += 2
+            while data[pos]:
+                pos += data[pos] + 1
+            pos += 1
+        return data[pos:data.rindex(b'\x3B')]
+
+    def write(self, indices: np.ndarray):
+        if self._file is None:
+            self._start(*indices.shape)
+        # 图形控制扩展: 处置方式1（保留），延时
+        self._file.write(b'\x21\xF9\x04\x04' + struct.pack('<H', self.delay) + b'\x00\x00')
+        self._file.write(self._image_block(indices))
+
+    def close(self):
+        if self._file is not None:
+            self._file.write(b'\x3B')
+            self._file.close()
+            self._file = None
+
+class FFmpegVideoWriter:
+    """通过ffmpeg管道逐帧编码视频（按扩展名选择容器）"""
+    def __init__(self, path: Path, fps: int):
+        if shutil.which('ffmpeg') is None:
+            raise RuntimeError("未找到ffmpeg可执行文件，无法导出视频")
+        self.path = Path(path)
+        self.fps = fps
+        self._colors = _palette().astype(np.uint8)
+        self._proc = None
+
+    def write(self, indices: np.ndarray):
+        if self._proc is None:
+            height, width = indices.shape
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._proc = subprocess.Popen(
+                ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+                 '-s', f'{width}x{height}', '-r', str(self.fps), '-i', '-',
+                 '-pix_fmt', 'yuv420p', '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', str(self.path)],
+                stdin=subprocess.PIPE)
+        self._proc.stdin.write(self._colors[indices].tobytes())
+
+    def close(self):
+        if self._proc is not None:
+            self._proc.stdin.close()
+            if self._proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg编码失败，返回码 {self._proc.returncode}")
+            self._proc = None
+
+class StreamingExporter:
+    """流式导出器: 直接由 grid.cells 生成调色板帧，后台线程经有界队列增量写入，内存占用与代数无关"""
+    def __init__(self, path: Path = None, every: int = None, scale: int = None,
+                 fps: int = None, max_queue: int = 64):
+        self.path = Path(path) if path else Config.GIF_EXPORT_PATH / Config.GIF_FILENAME
+        self.every = every or Config.GIF_FRAME_EVERY  # 帧抽取间隔（每 every 次采集写入一帧）
+        self.scale = scale or Config.CELL_SIZE
+        fps = fps or Config.GIF_FPS
+        if self.path.suffix.lower() == '.gif':
+            self.writer = StreamingGIFWriter(self.path, fps)
+        else:
+            self.writer = FFmpegVideoWriter(self.path, fps)
+        self.captured = 0
+        self.written_frames = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="GIFWriter", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            cells = self._queue.get()
+            if cells is None:
+                break
+            try:
+                self.writer.write(upscale(cells, self.scale))
+                self.written_frames += 1
+            except Exception as e:  # 错误在主线程下一次采集时抛出
+                self._error = e
+                logger.error(f"帧写入失败: {str(e)}")
+
+    def capture_frame(self, grid):
+        """采集一帧（仅拷贝 H×W 的 uint8 细胞数组，放大与编码在后台完成）"""
+        if self._error is not None:
+            raise RuntimeError("帧写入线程异常") from self._error
+        self.captured += 1
+        if (self.captured - 1) % self.every:
+            return
+        # 队列满时阻塞，保证不丢帧
+        self._queue.put((np.asarray(grid.cells) != 0).astype(np.uint8))
+
+    def save_gif(self) -> Path:
+        """等待写入完成并关闭文件"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+            self.writer.close()
+        if self._error is not None:
+            raise RuntimeError("帧写入线程异常") from self._error
+        return self.path